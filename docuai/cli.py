@@ -3,13 +3,40 @@ Command-line interface for DocuAI.
 """
 
 import click
+import importlib.util
 import os
 import sys
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 
-from .core.orchestrator import DocuAIOrchestrator
+
+@lru_cache(maxsize=None)
+def _has_module(name: str) -> bool:
+    """Check whether a module is installed without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+
+# Sample Python source with undocumented functions, used by `docuai test`
+_TEST_SAMPLE = '''def calculate_sum(a, b):
+    return a + b
+
+def process_data(data):
+    result = []
+    for item in data:
+        if item > 0:
+            result.append(item * 2)
+    return result
+
+class DataProcessor:
+    def __init__(self, config):
+        self.config = config
+    
+    def process(self, data):
+        return self.process_data(data)
+'''
 
 
 @click.group()
@@ -30,15 +57,15 @@ def analyze(directory, config, dry_run):
     console = Console()
     
     try:
-        orchestrator = DocuAIOrchestrator(config)
-        
-        if dry_run:
-            console.print("[blue]Running dry run analysis...[/blue]")
-            summary = orchestrator.run_dry_run(directory)
-            console.print(Panel(summary, title="Dry Run Results", border_style="yellow"))
-        else:
-            console.print("[blue]Running full analysis...[/blue]")
-            orchestrator.run_full_workflow(directory, create_pr=False)
+        from .core.orchestrator import DocuAIOrchestrator
+        with DocuAIOrchestrator(config) as orchestrator:
+            if dry_run:
+                console.print("[blue]Running dry run analysis...[/blue]")
+                summary = orchestrator.run_dry_run(directory)
+                console.print(Panel(summary, title="Dry Run Results", border_style="yellow"))
+            else:
+                console.print("[blue]Running full analysis...[/blue]")
+                orchestrator.run_full_workflow(directory, create_pr=False)
             
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -54,17 +81,17 @@ def generate(directory, config, no_pr):
     console = Console()
     
     try:
-        orchestrator = DocuAIOrchestrator(config)
-        
-        create_pr = not no_pr
-        pr_url = orchestrator.run_full_workflow(directory, create_pr=create_pr)
-        
-        if pr_url:
-            console.print(f"[green]✅ Success! Pull request created: {pr_url}[/green]")
-        elif not create_pr:
-            console.print("[green]✅ Documentation generation completed![/green]")
-        else:
-            console.print("[yellow]⚠️  No changes were made or PR creation failed.[/yellow]")
+        from .core.orchestrator import DocuAIOrchestrator
+        with DocuAIOrchestrator(config) as orchestrator:
+            create_pr = not no_pr
+            pr_url = orchestrator.run_full_workflow(directory, create_pr=create_pr)
+            
+            if pr_url:
+                console.print(f"[green]✅ Success! Pull request created: {pr_url}[/green]")
+            elif not create_pr:
+                console.print("[green]✅ Documentation generation completed![/green]")
+            else:
+                console.print("[yellow]⚠️  No changes were made or PR creation failed.[/yellow]")
             
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -95,20 +122,18 @@ def setup(config):
         console.print("[yellow]⚠️  GitHub token not found. Set GITHUB_TOKEN environment variable for PR creation.[/yellow]")
     
     # Check Python dependencies
-    try:
-        import torch
-        import transformers
+    missing = [m for m in ('torch', 'transformers') if not _has_module(m)]
+    if not missing:
         console.print("[green]✅ AI dependencies available[/green]")
-    except ImportError as e:
-        console.print(f"[red]❌ Missing AI dependencies: {e}[/red]")
+    else:
+        console.print(f"[red]❌ Missing AI dependencies: {', '.join(missing)}[/red]")
         console.print("Run: pip install -r requirements.txt")
     
     # Check tree-sitter dependencies
-    try:
-        import tree_sitter
+    if _has_module('tree_sitter'):
         console.print("[green]✅ Tree-sitter available[/green]")
-    except ImportError as e:
-        console.print(f"[yellow]⚠️  Tree-sitter not available: {e}[/yellow]")
+    else:
+        console.print("[yellow]⚠️  Tree-sitter not available: No module named 'tree_sitter'[/yellow]")
         console.print("Some language features may not work optimally.")
     
     console.print("\n[green]Setup complete![/green]")
@@ -123,43 +148,26 @@ def test(config):
     
     console.print("[blue]Creating test file...[/blue]")
     
-    # Create a test Python file with undocumented functions
-    test_content = '''def calculate_sum(a, b):
-    return a + b
-
-def process_data(data):
-    result = []
-    for item in data:
-        if item > 0:
-            result.append(item * 2)
-    return result
-
-class DataProcessor:
-    def __init__(self, config):
-        self.config = config
-    
-    def process(self, data):
-        return self.process_data(data)
-'''
-    
-    test_file = Path("test_sample.py")
-    test_file.write_text(test_content)
+    # Write the sample into its own directory so only it gets analyzed
+    test_dir = tempfile.TemporaryDirectory(prefix="docuai-test-")
+    test_file = Path(test_dir.name) / "test_sample.py"
+    test_file.write_text(_TEST_SAMPLE)
     
     try:
-        orchestrator = DocuAIOrchestrator(config)
-        console.print("[blue]Running test analysis...[/blue]")
-        
-        # Run dry run on test file
-        summary = orchestrator.run_dry_run(".")
-        console.print(Panel(summary, title="Test Results", border_style="green"))
+        from .core.orchestrator import DocuAIOrchestrator
+        with DocuAIOrchestrator(config) as orchestrator:
+            console.print("[blue]Running test analysis...[/blue]")
+            
+            # Run dry run on test file
+            summary = orchestrator.run_dry_run(test_dir.name)
+            console.print(Panel(summary, title="Test Results", border_style="green"))
         
     except Exception as e:
         console.print(f"[red]Test failed: {e}[/red]")
     finally:
         # Clean up test file
-        if test_file.exists():
-            test_file.unlink()
-            console.print("[blue]Cleaned up test file[/blue]")
+        test_dir.cleanup()
+        console.print("[blue]Cleaned up test file[/blue]")
 
 
 if __name__ == '__main__':
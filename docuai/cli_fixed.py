@@ -3,23 +3,58 @@ Fixed CLI for DocuAI that falls back to simple components when AI model fails.
 """
 
 import click
+import importlib.util
 import os
 import sys
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 
-# Try to import the main orchestrator, fall back to simple components
-try:
-    from .core.orchestrator import DocuAIOrchestrator
-    ORCHESTRATOR_AVAILABLE = True
-except Exception as e:
-    print(f"Warning: Main orchestrator not available: {e}")
-    ORCHESTRATOR_AVAILABLE = False
 
-# Import simple components as fallback
-from .core.simple_analyzer import SimpleAnalyzer
-from .core.simple_generator import SimpleGenerator
+@lru_cache(maxsize=None)
+def _get_orchestrator_cls():
+    """Import the main orchestrator on first use, or return None if unavailable.
+
+    The orchestrator pulls in torch/transformers, so it is only imported by
+    the commands that need it rather than at CLI startup.
+    """
+    try:
+        from .core.orchestrator import DocuAIOrchestrator
+    except Exception as e:
+        print(f"Warning: Main orchestrator not available: {e}")
+        return None
+    return DocuAIOrchestrator
+
+
+@lru_cache(maxsize=None)
+def _has_module(name: str) -> bool:
+    """Check whether a module is installed without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+
+# Sample Python source with undocumented functions, used by `docuai test`
+_TEST_SAMPLE = '''def calculate_sum(a, b):
+    return a + b
+
+def process_data(data):
+    result = []
+    for item in data:
+        if item > 0:
+            result.append(item * 2)
+    return result
+
+class DataProcessor:
+    def __init__(self, config):
+        self.config = config
+    
+    def process(self, data):
+        return self._transform_data(data)
+    
+    def _transform_data(self, data):
+        return [item * 2 for item in data if isinstance(item, (int, float))]
+'''
 
 
 @click.group()
@@ -40,17 +75,21 @@ def analyze(directory, config, dry_run):
     console = Console()
     
     try:
-        if ORCHESTRATOR_AVAILABLE:
-            orchestrator = DocuAIOrchestrator(config)
-            if dry_run:
-                console.print("[blue]Running dry run analysis...[/blue]")
-                summary = orchestrator.run_dry_run(directory)
-                console.print(Panel(summary, title="Dry Run Results", border_style="yellow"))
-            else:
-                console.print("[blue]Running full analysis...[/blue]")
-                orchestrator.run_full_workflow(directory, create_pr=False)
+        DocuAIOrchestrator = _get_orchestrator_cls()
+        if DocuAIOrchestrator is not None:
+            with DocuAIOrchestrator(config) as orchestrator:
+                if dry_run:
+                    console.print("[blue]Running dry run analysis...[/blue]")
+                    summary = orchestrator.run_dry_run(directory)
+                    console.print(Panel(summary, title="Dry Run Results", border_style="yellow"))
+                else:
+                    console.print("[blue]Running full analysis...[/blue]")
+                    orchestrator.run_full_workflow(directory, create_pr=False)
         else:
             # Use simple components
+            from .core.simple_analyzer import SimpleAnalyzer
+            from .core.simple_generator import SimpleGenerator
+            
             console.print("[blue]Using simple analyzer (AI model not available)...[/blue]")
             analyzer = SimpleAnalyzer()
             results = analyzer.analyze_directory(directory)
@@ -93,19 +132,23 @@ def generate(directory, config, no_pr):
     console = Console()
     
     try:
-        if ORCHESTRATOR_AVAILABLE:
-            orchestrator = DocuAIOrchestrator(config)
-            create_pr = not no_pr
-            pr_url = orchestrator.run_full_workflow(directory, create_pr=create_pr)
-            
-            if pr_url:
-                console.print(f"[green]✅ Success! Pull request created: {pr_url}[/green]")
-            elif not create_pr:
-                console.print("[green]✅ Documentation generation completed![/green]")
-            else:
-                console.print("[yellow]⚠️  No changes were made or PR creation failed.[/yellow]")
+        DocuAIOrchestrator = _get_orchestrator_cls()
+        if DocuAIOrchestrator is not None:
+            with DocuAIOrchestrator(config) as orchestrator:
+                create_pr = not no_pr
+                pr_url = orchestrator.run_full_workflow(directory, create_pr=create_pr)
+                
+                if pr_url:
+                    console.print(f"[green]✅ Success! Pull request created: {pr_url}[/green]")
+                elif not create_pr:
+                    console.print("[green]✅ Documentation generation completed![/green]")
+                else:
+                    console.print("[yellow]⚠️  No changes were made or PR creation failed.[/yellow]")
         else:
             # Use simple components
+            from .core.simple_analyzer import SimpleAnalyzer
+            from .core.simple_generator import SimpleGenerator
+            
             console.print("[blue]Using simple components (AI model not available)...[/blue]")
             analyzer = SimpleAnalyzer()
             results = analyzer.analyze_directory(directory)
@@ -159,22 +202,20 @@ def setup(config):
         console.print("[yellow]⚠️  GitHub token not found. Set GITHUB_TOKEN environment variable for PR creation.[/yellow]")
     
     # Check Python dependencies
-    try:
-        import torch
-        import transformers
+    missing = [m for m in ('torch', 'transformers') if not _has_module(m)]
+    if not missing:
         console.print("[green]✅ AI dependencies available[/green]")
         console.print("[green]✅ Full DocuAI functionality available[/green]")
-    except ImportError as e:
-        console.print(f"[yellow]⚠️  AI dependencies not available: {e}[/yellow]")
+    else:
+        console.print(f"[yellow]⚠️  AI dependencies not available: {', '.join(missing)}[/yellow]")
         console.print("[blue]ℹ️  Using simple mode (rule-based comment generation)[/blue]")
         console.print("Run: pip install torch transformers for full AI functionality")
     
     # Check tree-sitter dependencies
-    try:
-        import tree_sitter
+    if _has_module('tree_sitter'):
         console.print("[green]✅ Tree-sitter available[/green]")
-    except ImportError as e:
-        console.print(f"[yellow]⚠️  Tree-sitter not available: {e}[/yellow]")
+    else:
+        console.print("[yellow]⚠️  Tree-sitter not available: No module named 'tree_sitter'[/yellow]")
         console.print("[blue]ℹ️  Using simple regex-based analysis[/blue]")
     
     console.print("\n[green]Setup complete![/green]")
@@ -189,44 +230,28 @@ def test(config):
     
     console.print("[blue]Creating test file...[/blue]")
     
-    # Create a test Python file with undocumented functions
-    test_content = '''def calculate_sum(a, b):
-    return a + b
-
-def process_data(data):
-    result = []
-    for item in data:
-        if item > 0:
-            result.append(item * 2)
-    return result
-
-class DataProcessor:
-    def __init__(self, config):
-        self.config = config
-    
-    def process(self, data):
-        return self._transform_data(data)
-    
-    def _transform_data(self, data):
-        return [item * 2 for item in data if isinstance(item, (int, float))]
-'''
-    
-    test_file = Path("test_sample.py")
-    test_file.write_text(test_content)
+    # Write the sample into its own directory so only it gets analyzed
+    test_dir = tempfile.TemporaryDirectory(prefix="docuai-test-")
+    test_file = Path(test_dir.name) / "test_sample.py"
+    test_file.write_text(_TEST_SAMPLE)
     
     try:
-        if ORCHESTRATOR_AVAILABLE:
-            orchestrator = DocuAIOrchestrator(config)
-            console.print("[blue]Running test analysis...[/blue]")
-            
-            # Run dry run on test file
-            summary = orchestrator.run_dry_run(".")
-            console.print(Panel(summary, title="Test Results", border_style="green"))
+        DocuAIOrchestrator = _get_orchestrator_cls()
+        if DocuAIOrchestrator is not None:
+            with DocuAIOrchestrator(config) as orchestrator:
+                console.print("[blue]Running test analysis...[/blue]")
+                
+                # Run dry run on test file
+                summary = orchestrator.run_dry_run(test_dir.name)
+                console.print(Panel(summary, title="Test Results", border_style="green"))
         else:
             # Use simple components
+            from .core.simple_analyzer import SimpleAnalyzer
+            from .core.simple_generator import SimpleGenerator
+            
             console.print("[blue]Using simple components for test...[/blue]")
             analyzer = SimpleAnalyzer()
-            results = analyzer.analyze_file("test_sample.py")
+            results = analyzer.analyze_file(str(test_file))
             
             if results:
                 console.print(f"[green]✅ Found {len(results)} undocumented functions/classes:[/green]")
@@ -243,9 +268,8 @@ class DataProcessor:
         console.print(f"[red]Test failed: {e}[/red]")
     finally:
         # Clean up test file
-        if test_file.exists():
-            test_file.unlink()
-            console.print("[blue]Cleaned up test file[/blue]")
+        test_dir.cleanup()
+        console.print("[blue]Cleaned up test file[/blue]")
 
 
 if __name__ == '__main__':
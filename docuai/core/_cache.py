@@ -0,0 +1,67 @@
+"""
+On-disk cache of results keyed by content fingerprints.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Optional
+
+
+def fingerprint(*parts) -> str:
+    """Hash str or bytes-like parts into a hex digest; part boundaries are part of the hash."""
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed map from fingerprints to JSON values, shareable between threads."""
+    
+    def __init__(self, path: str, table: str):
+        """Open or create the cache database and its table."""
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            # WAL lets concurrent DocuAI runs read while another writes
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)'
+            )
+            self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get the value stored for a key, or None if there is none."""
+        with self._lock:
+            row = self._conn.execute(f'SELECT value FROM {self._table} WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def put(self, key: str, value: Any):
+        """Store a value for a key; it is written to disk on the next flush."""
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self._table} (key, value) VALUES (?, ?)', (key, json.dumps(value))
+            )
+    
+    def flush(self):
+        """Commit values stored since the last flush."""
+        with self._lock:
+            self._conn.commit()
+    
+    def close(self):
+        """Flush and close the database."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
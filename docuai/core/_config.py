@@ -0,0 +1,124 @@
+"""
+Config file loading shared by the DocuAI components.
+"""
+
+import copy
+import json
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from typing import FrozenSet, List, Optional
+
+from ._cache import fingerprint
+
+
+def _parse_yaml(stream):
+    """Parse YAML, importing PyYAML on first use and preferring the libyaml loader."""
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+# Parsed config files keyed by absolute path, validated against (mtime, size)
+_YAML_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _sidecar_path(path: str) -> str:
+    """Get the path of the JSON cache kept for a YAML config in the user cache directory."""
+    # Kept out of the config's directory, which is usually the repo being documented
+    cache_dir = os.path.join(os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'docuai', 'config')
+    return os.path.join(cache_dir, fingerprint(os.path.abspath(path)) + '.json')
+
+
+def _read_json_sidecar(path: str, st: os.stat_result) -> Optional[dict]:
+    """Read the JSON sidecar for a YAML file if it matches the file's path, mtime and size."""
+    try:
+        with open(_sidecar_path(path), 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if (
+        not isinstance(cached, dict)
+        or cached.get('path') != os.path.abspath(path)
+        or cached.get('mtime') != st.st_mtime
+        or cached.get('size') != st.st_size
+    ):
+        return None
+    return cached.get('data')
+
+
+def _write_json_sidecar(path: str, st: os.stat_result, data) -> None:
+    """Atomically write a JSON sidecar for a YAML file, ignoring failures."""
+    try:
+        text = json.dumps({
+            'path': os.path.abspath(path), 'mtime': st.st_mtime, 'size': st.st_size, 'data': data
+        })
+    except (TypeError, ValueError):
+        # Config not representable as JSON
+        return
+    if json.loads(text)['data'] != data:
+        # Lossy round-trip, e.g. YAML int or bool keys would come back as strings
+        return
+    
+    sidecar = _sidecar_path(path)
+    try:
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(sidecar), suffix='.tmp')
+    except OSError:
+        # Unwritable cache directory: just skip the sidecar
+        return
+    
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def load_config(path: str, max_entries: int = 100) -> dict:
+    """Load a YAML file, reusing the parsed result while the file is unchanged."""
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    
+    entry = _YAML_CACHE.get(key)
+    if entry and entry[0] == st.st_mtime and entry[1] == st.st_size:
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(entry[2])
+    
+    data = _read_json_sidecar(path, st)
+    if data is None:
+        with open(path, 'r') as f:
+            data = _parse_yaml(f)
+        _write_json_sidecar(path, st, data)
+    
+    _YAML_CACHE[key] = (st.st_mtime, st.st_size, data)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > max_entries:
+        _YAML_CACHE.popitem(last=False)
+    
+    # Hand out a copy so callers mutating their config can't corrupt the cache
+    return copy.deepcopy(data)
+
+
+# A "**/<name>/**" ignore glob: every path under a directory called <name>
+_IGNORE_DIR_RE = re.compile(r'\*\*/([^*?\[\]/]+)/\*\*')
+
+
+def ignored_dir_names(patterns: List[str]) -> FrozenSet[str]:
+    """Get the directory names that "**/<name>/**" ignore patterns exclude outright."""
+    names = set()
+    for pattern in patterns:
+        match = _IGNORE_DIR_RE.fullmatch(pattern)
+        if match:
+            names.add(os.path.normcase(match.group(1)))
+    return frozenset(names)
+
+
+def walk_ignore_patterns(patterns: List[str]) -> List[str]:
+    """Get the ignore patterns a walk that prunes ignored_dir_names still has to match."""
+    return [pattern for pattern in patterns if not _IGNORE_DIR_RE.fullmatch(pattern)]
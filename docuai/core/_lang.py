@@ -0,0 +1,22 @@
+"""
+File extension to language mapping shared by the DocuAI components.
+"""
+
+from types import MappingProxyType
+
+
+# File extension to language name
+EXT_TO_LANG = MappingProxyType({
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.jsx': 'javascript',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.cc': 'cpp',
+    '.cxx': 'cpp',
+    '.c': 'c',
+    '.go': 'go',
+    '.rs': 'rust',
+})
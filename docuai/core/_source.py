@@ -0,0 +1,126 @@
+"""
+Source scanning helpers shared by the DocuAI analyzers.
+"""
+
+import mmap
+import os
+import re
+from typing import Callable, FrozenSet, Iterator, List, Optional, Union
+
+
+# Lines starting with these are comment lines rather than code
+COMMENT_LINE_PREFIXES = ('//', '#', '/*', '*')
+
+
+def _is_python_doc_line(line: str) -> bool:
+    """Check whether a stripped Python line is a comment or part of a docstring."""
+    return line.startswith('#') or '"""' in line or "'''" in line
+
+
+def _is_c_style_doc_line(line: str) -> bool:
+    """Check whether a stripped line is a // or /* */ comment line."""
+    return line.startswith('//') or '/*' in line or '*/' in line
+
+
+def _is_line_comment(line: str) -> bool:
+    """Check whether a stripped line is a // comment."""
+    return line.startswith('//')
+
+
+# Documentation line check by language, looked up once per definition instead of per line
+DOC_LINE_CHECKS = {
+    'python': _is_python_doc_line,
+    'javascript': _is_c_style_doc_line,
+    'typescript': _is_c_style_doc_line,
+    'java': _is_c_style_doc_line,
+    'cpp': _is_c_style_doc_line,
+    'c': _is_c_style_doc_line,
+    'go': _is_line_comment,
+    'rust': _is_line_comment,
+}
+
+
+# (compiled pattern, definition type) pairs keyed by language
+_FUNC_REGEXES_PY = [
+    (re.compile(r'def\s+(\w+)\s*\('), 'function'),
+    (re.compile(r'class\s+(\w+)\s*[\(:]'), 'class'),
+]
+_FUNC_REGEXES_JS = [
+    (re.compile(r'function\s+(\w+)\s*\('), 'function'),
+    (re.compile(r'const\s+(\w+)\s*=\s*\('), 'function'),
+    (re.compile(r'let\s+(\w+)\s*=\s*\('), 'function'),
+    (re.compile(r'var\s+(\w+)\s*=\s*\('), 'function'),
+    (re.compile(r'(\w+)\s*:\s*function'), 'function'),
+    (re.compile(r'class\s+(\w+)\s*[{\s]'), 'class'),
+]
+FUNC_REGEXES = {
+    'python': _FUNC_REGEXES_PY,
+    'javascript': _FUNC_REGEXES_JS,
+    'typescript': _FUNC_REGEXES_JS,
+}
+
+
+def newline_offsets(content: str) -> List[int]:
+    """Get the sorted offsets of every newline in the content."""
+    offsets = []
+    pos = content.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = content.find('\n', pos + 1)
+    return offsets
+
+
+def prev_lines(content: Union[str, bytes, mmap.mmap], position: int, n: int) -> List[str]:
+    """Get up to n stripped lines ending at position, nearest first."""
+    is_bytes = not isinstance(content, str)
+    newline_char = b'\n' if is_bytes else '\n'
+    lines = []
+    end = position
+    while len(lines) < n:
+        newline = content.rfind(newline_char, 0, end)
+        line = content[newline + 1:end].strip()
+        # Raw source from tree-sitter: decode just the few lines looked at
+        lines.append(line.decode('utf-8', 'replace') if is_bytes else line)
+        if newline == -1:
+            break
+        end = newline
+    return lines
+
+
+def iter_source_files(directory: str, ignore_re: Optional["re.Pattern"], walk_ignore_re: Optional["re.Pattern"],
+                      ignore_dir_names: FrozenSet[str], is_source: Callable[[str], bool]) -> Iterator[str]:
+    """Yield paths of files under a directory whose name passes is_source, pruning ignored dirs.
+    
+    walk_ignore_re holds the ignore globs left once ignore_dir_names are pruned by
+    name; ignore_re holds all of them and is used when the walk starts inside an
+    ignored directory.
+    """
+    if not any(os.path.normcase(part) in ignore_dir_names for part in directory.split(os.sep)):
+        ignore_re = walk_ignore_re
+    
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                entries = list(entries)
+        except OSError:
+            # Unreadable directory: skip it like os.walk does
+            continue
+        
+        subdirs = []
+        for entry in entries:
+            # Directories excluded by name are pruned without running the ignore regex
+            if os.path.normcase(entry.name) in ignore_dir_names and entry.is_dir():
+                continue
+            if ignore_re is not None and ignore_re.match(os.path.normcase(entry.path)):
+                continue
+            # DirEntry caches the file type from the directory listing, no extra stat
+            if entry.is_dir():
+                # Like os.walk, don't descend into symlinked directories
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif is_source(entry.name):
+                yield entry.path
+        
+        # Reversed so subdirectories are visited in listing order, as with os.walk
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,50 @@
+"""
+Rule-based comment templates shared by the DocuAI comment generators.
+"""
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
+
+_CAMEL_RE = re.compile(r'([a-z])([A-Z])')
+
+
+@lru_cache(maxsize=4096)
+def camel_to_sentence(text: str) -> str:
+    """Convert camelCase to sentence case."""
+    # Insert space before capital letters, then lowercase and capitalize
+    return _CAMEL_RE.sub(r'\1 \2', text).lower().capitalize()
+
+
+# Comment templates keyed by (language, kind); {s} is the sentence-cased name
+_JSDOC_TEMPLATES = {
+    'function': '/**\n * {s}\n * \n * @param {{}} TODO: Add parameter descriptions\n * @returns {{}} TODO: Add return description\n */',
+    'class': '/**\n * {s} class\n * \n * TODO: Add class description\n */',
+}
+_JAVADOC_TEMPLATES = {
+    'function': '/**\n * {s}\n * \n * @param TODO: Add parameter descriptions\n * @return TODO: Add return description\n */',
+    'class': '/**\n * {s} class\n * \n * TODO: Add class description\n */',
+}
+COMMENT_TEMPLATES = MappingProxyType({
+    ('python', 'function'): '"""\n    {s}.\n    \n    Args:\n        TODO: Add parameter descriptions\n    \n    Returns:\n        TODO: Add return description\n    """',
+    ('python', 'class'): '"""\n    {s} class.\n    \n    TODO: Add class description\n    """',
+    **{(lang, kind): tpl for lang in ('javascript', 'typescript') for kind, tpl in _JSDOC_TEMPLATES.items()},
+    **{(lang, kind): tpl for lang in ('java', 'cpp', 'c') for kind, tpl in _JAVADOC_TEMPLATES.items()},
+    ('go', 'function'): '// {s} TODO: Add function description\n// TODO: Add parameter and return descriptions',
+    ('go', 'class'): '// {s} TODO: Add struct/interface description',
+    ('rust', 'function'): '/// {s}\n/// TODO: Add function description\n/// TODO: Add parameter and return descriptions',
+    ('rust', 'class'): '/// {s} TODO: Add struct/trait description',
+})
+
+
+def template_comment(name: str, def_type: str, language: str) -> str:
+    """Fill in the comment template for a definition's language and kind."""
+    # Anything that isn't a function (class, struct, trait...) gets the class template
+    kind = 'function' if def_type == 'function' else 'class'
+    
+    template = COMMENT_TEMPLATES.get((language, kind))
+    if template is None:
+        # Default fallback
+        return f'// TODO: Add documentation for {name}'
+    return template.format(s=camel_to_sentence(name))
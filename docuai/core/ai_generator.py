@@ -2,17 +2,108 @@
 AI-powered comment generation module using free models.
 """
 
+import atexit
 import os
-import re
+from functools import lru_cache
 from typing import List, Dict, Optional
-import torch
-from transformers import (
-    AutoTokenizer, 
-    AutoModelForCausalLM, 
-    pipeline,
-    set_seed
-)
-import yaml
+
+from ._cache import ResultCache, fingerprint
+from ._config import load_config
+from ._templates import camel_to_sentence, template_comment
+
+# torch and transformers take seconds to import, so they are only loaded by
+# _import_ai_dependencies() once a local model is actually needed
+torch = None
+AutoTokenizer = None
+AutoModelForCausalLM = None
+pipeline = None
+
+
+def _import_ai_dependencies():
+    """Import torch and transformers into this module's globals."""
+    global torch, AutoTokenizer, AutoModelForCausalLM, pipeline
+    import torch
+    from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+
+
+@lru_cache(maxsize=None)
+def _has_cuda() -> bool:
+    """Check for a CUDA device once; the first check initializes the driver."""
+    return torch.cuda.is_available()
+
+
+# Padded prompt lengths used when the model is compiled, so each length compiles once
+_PROMPT_BUCKETS = (32, 48, 64, 96, 128, 192, 256)
+
+
+def _bucket_length(length: int) -> int:
+    """Round a prompt length up to the nearest bucket, or leave it if too long."""
+    for bucket in _PROMPT_BUCKETS:
+        if length <= bucket:
+            return bucket
+    return length
+
+
+# (opener, closer) used to wrap generated comments, keyed by language
+_WRAP = {
+    'python': ('"""\n    ', '\n    """'),
+    'javascript': ('/**\n * ', '\n */'),
+    'typescript': ('/**\n * ', '\n */'),
+    'java': ('/**\n * ', '\n */'),
+    'cpp': ('/**\n * ', '\n */'),
+    'c': ('/**\n * ', '\n */'),
+    'go': ('// ', ''),
+    'rust': ('/// ', ''),
+}
+# Same table with the stripped markers precomputed for the startswith/endswith probes
+_COMMENT_WRAP = {
+    language: (opener, closer, opener.strip(), closer.strip())
+    for language, (opener, closer) in _WRAP.items()
+}
+_NO_WRAP = ('', '', '', '')
+
+# Comment format instruction appended to prompts, keyed by language
+_FORMAT_HINTS = {
+    'python': ". Use docstring format with triple quotes.",
+    'javascript': ". Use JSDoc format with /** */.",
+    'typescript': ". Use JSDoc format with /** */.",
+    'java': ". Use JavaDoc format with /** */.",
+    'cpp': ". Use JavaDoc format with /** */.",
+    'c': ". Use JavaDoc format with /** */.",
+    'go': ". Use Go comment format with //.",
+    'rust': ". Use Rust documentation format with ///.",
+}
+
+
+# Live generators keyed by absolute config path, shared so the model loads once per process
+_GENERATORS: Dict[str, "AICommentGenerator"] = {}
+
+
+def get_generator(config_path: str = "config.yaml") -> "AICommentGenerator":
+    """Get the shared comment generator for a config file, loading it on first use.
+    
+    Each call takes a reference that must be given back with release_generator;
+    the generator itself stays loaded until close_generators runs at exit.
+    """
+    key = os.path.abspath(config_path)
+    generator = _GENERATORS.get(key)
+    if generator is None:
+        generator = AICommentGenerator(config_path)
+        _GENERATORS[key] = generator
+    generator._refs += 1
+    return generator
+
+
+def release_generator(generator: "AICommentGenerator"):
+    """Give back a get_generator reference, keeping the model warm for the next caller."""
+    generator._refs = max(generator._refs - 1, 0)
+
+
+@atexit.register
+def close_generators():
+    """Close every shared generator, whether or not references are still held."""
+    for generator in list(_GENERATORS.values()):
+        generator.close()
 
 
 class AICommentGenerator:
@@ -20,20 +111,34 @@ class AICommentGenerator:
     
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize the AI generator with configuration."""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         self.ai_config = self.config['ai']
         self.model_name = self.ai_config['model_name']
         self.max_tokens = self.ai_config['max_tokens']
         self.temperature = self.ai_config['temperature']
+        self.deterministic = self.ai_config.get('deterministic', True)
         self.use_local_model = self.ai_config['use_local_model']
+        self.quantize = self.ai_config.get('quantize')
+        self.compile = self.ai_config.get('compile', False)
         
         # Initialize model and tokenizer
         self.model = None
         self.tokenizer = None
         self.pipeline = None
+        self._prompt_prefix_ids = {}
+        # get_generator references still held to this generator
+        self._refs = 0
+        # Generated comments keyed by (name, type, language, context hash)
+        self._memo = {}
+        self._cache = None
         self._setup_model()
+        
+        # Optional on-disk cache so repeat runs skip the model; only reproducible
+        # (greedy) model output is worth keeping across runs
+        cache_path = self.ai_config.get('cache')
+        if cache_path and self.pipeline and self.deterministic:
+            self._cache = ResultCache(cache_path, 'comments')
     
     def _setup_model(self):
         """Setup the AI model for comment generation."""
@@ -43,25 +148,36 @@ class AICommentGenerator:
                 # Use a smaller, free model that's good for code generation
                 model_name = self.model_name
                 
-                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-                self.model = AutoModelForCausalLM.from_pretrained(
-                    model_name,
-                    torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
-                    device_map="auto" if torch.cuda.is_available() else None
-                )
+                _import_ai_dependencies()
+                self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+                self.model = None
+                if self.quantize == 'int8' and not _has_cuda():
+                    self.model = self._load_quantized_model(model_name)
+                if self.model is None:
+                    self.model = AutoModelForCausalLM.from_pretrained(
+                        model_name,
+                        torch_dtype=torch.float16 if _has_cuda() else torch.float32,
+                        device_map="auto" if _has_cuda() else None
+                    )
+                    # Inference only: disable dropout and autograd bookkeeping
+                    self.model.eval()
+                    self.model.requires_grad_(False)
+                    if self.compile:
+                        self._compile_model()
                 
                 # Add padding token if it doesn't exist
                 if self.tokenizer.pad_token is None:
                     self.tokenizer.pad_token = self.tokenizer.eos_token
+                # Causal LMs must be left-padded when prompts are batched
+                self.tokenizer.padding_side = 'left'
                 
                 # Create text generation pipeline
                 self.pipeline = pipeline(
                     "text-generation",
                     model=self.model,
                     tokenizer=self.tokenizer,
-                    max_length=self.max_tokens,
-                    temperature=self.temperature,
-                    do_sample=True,
+                    max_new_tokens=self.max_tokens,
+                    **self._sampling_kwargs(),
                     pad_token_id=self.tokenizer.eos_token_id
                 )
                 
@@ -77,55 +193,109 @@ class AICommentGenerator:
             self.model = None
             self.pipeline = None
     
+    def close(self):
+        """Release the model, tokenizer and pipeline and free cached GPU memory."""
+        self.pipeline = None
+        self.model = None
+        self.tokenizer = None
+        self._prompt_prefix_ids = {}
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        
+        # A released generator must not be handed out again
+        for key, generator in list(_GENERATORS.items()):
+            if generator is self:
+                del _GENERATORS[key]
+        
+        # Drop the last references to the weights before emptying the CUDA cache
+        import gc
+        gc.collect()
+        if torch is not None and _has_cuda():
+            torch.cuda.empty_cache()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _sampling_kwargs(self) -> Dict:
+        """Get the decoding options shared by every generation call."""
+        if self.deterministic:
+            # Greedy decoding: reproducible output that is safe to memoize
+            return {'do_sample': False, 'num_beams': 1}
+        return {'do_sample': True, 'temperature': self.temperature}
+    
+    def _compile_model(self):
+        """Compile the model's forward pass with dynamic shapes for the growing decode length."""
+        if not hasattr(torch, 'compile'):
+            print("torch.compile not available, skipping model compilation...")
+            self.compile = False
+            return
+        
+        try:
+            # Compile forward rather than the module so generate() and the pipeline use it;
+            # the sequence grows every decoding step, so static shapes would recompile each time
+            self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead", dynamic=True)
+        except Exception as e:
+            print(f"Error compiling model: {e}")
+            self.compile = False
+    
+    def _load_quantized_model(self, model_name: str):
+        """Load an int8-quantized ONNX Runtime model for CPU inference."""
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        except ImportError:
+            print("optimum[onnxruntime] not installed, skipping int8 quantization...")
+            return None
+        
+        quantized_dir = os.path.join(
+            os.path.expanduser("~"), ".cache", "docuai", "onnx-int8", model_name.replace("/", "--")
+        )
+        if os.path.isdir(quantized_dir):
+            # Exported and quantized by an earlier run
+            try:
+                return ORTModelForCausalLM.from_pretrained(quantized_dir, provider="CPUExecutionProvider")
+            except Exception as e:
+                print(f"Error loading cached quantized model, re-exporting: {e}")
+        
+        try:
+            model = ORTModelForCausalLM.from_pretrained(
+                model_name,
+                export=True,
+                provider="CPUExecutionProvider"
+            )
+            
+            # Dynamic int8 quantization uses VNNI dot products where available
+            quantizer = ORTQuantizer.from_pretrained(model)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+            
+            return ORTModelForCausalLM.from_pretrained(quantized_dir, provider="CPUExecutionProvider")
+        except Exception as e:
+            print(f"Error quantizing model: {e}")
+            print("Falling back to full-precision model...")
+            return None
+    
     def _generate_rule_based_comment(self, function_info: Dict, language: str) -> str:
         """Generate comments using rule-based approach as fallback."""
-        name = function_info['name']
-        func_type = function_info['type']
-        
-        if language == 'python':
-            if func_type == 'function':
-                return f'"""\n    {self._camel_to_sentence(name)}.\n    \n    Args:\n        TODO: Add parameter descriptions\n    \n    Returns:\n        TODO: Add return description\n    """'
-            else:  # class
-                return f'"""\n    {self._camel_to_sentence(name)} class.\n    \n    TODO: Add class description\n    """'
-        
-        elif language in ['javascript', 'typescript']:
-            if func_type == 'function':
-                return f'/**\n * {self._camel_to_sentence(name)}\n * \n * @param {{}} TODO: Add parameter descriptions\n * @returns {{}} TODO: Add return description\n */'
-            else:  # class
-                return f'/**\n * {self._camel_to_sentence(name)} class\n * \n * TODO: Add class description\n */'
-        
-        elif language in ['java', 'cpp', 'c']:
-            if func_type == 'function':
-                return f'/**\n * {self._camel_to_sentence(name)}\n * \n * @param TODO: Add parameter descriptions\n * @return TODO: Add return description\n */'
-            else:  # class
-                return f'/**\n * {self._camel_to_sentence(name)} class\n * \n * TODO: Add class description\n */'
-        
-        elif language == 'go':
-            if func_type == 'function':
-                return f'// {self._camel_to_sentence(name)} TODO: Add function description\n// TODO: Add parameter and return descriptions'
-            else:  # class/struct
-                return f'// {self._camel_to_sentence(name)} TODO: Add struct/interface description'
-        
-        elif language == 'rust':
-            if func_type == 'function':
-                return f'/// {self._camel_to_sentence(name)}\n/// TODO: Add function description\n/// TODO: Add parameter and return descriptions'
-            else:  # struct/trait
-                return f'/// {self._camel_to_sentence(name)} TODO: Add struct/trait description'
-        
-        # Default fallback
-        return f'// TODO: Add documentation for {name}'
+        return template_comment(function_info['name'], function_info['type'], language)
     
     def _camel_to_sentence(self, text: str) -> str:
         """Convert camelCase to sentence case."""
-        # Insert space before capital letters
-        result = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-        # Convert to lowercase and capitalize first letter
-        return result.lower().capitalize()
+        return camel_to_sentence(text)
     
     def _generate_ai_comment(self, function_info: Dict, language: str, context: str = "") -> str:
         """Generate comment using AI model."""
+        comment = self._generate_model_comment(function_info, language, context)
+        return comment if comment is not None else self._generate_rule_based_comment(function_info, language)
+    
+    def _generate_model_comment(self, function_info: Dict, language: str, context: str = "") -> Optional[str]:
+        """Generate a comment with the model, or None if there is no model or it produced nothing."""
         if not self.pipeline:
-            return self._generate_rule_based_comment(function_info, language)
+            return None
         
         try:
             name = function_info['name']
@@ -134,88 +304,178 @@ class AICommentGenerator:
             # Create prompt for the AI model
             prompt = self._create_prompt(name, func_type, language, context)
             
-            # Generate comment
-            result = self.pipeline(
-                prompt,
-                max_length=len(prompt.split()) + self.max_tokens,
-                num_return_sequences=1,
-                temperature=self.temperature,
-                do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id
-            )
+            # Generate comment, falling back to the pipeline if direct generation fails
+            try:
+                generated_text = self._generate_with_cached_prefix(prompt, language, func_type)
+            except Exception:
+                with torch.inference_mode():
+                    result = self.pipeline(
+                        prompt,
+                        max_new_tokens=self.max_tokens,
+                        num_return_sequences=1,
+                        **self._sampling_kwargs(),
+                        pad_token_id=self.tokenizer.eos_token_id
+                    )
+                generated_text = result[0]['generated_text']
             
-            generated_text = result[0]['generated_text']
             comment = self._extract_comment_from_generated(generated_text, prompt, language)
             
-            return comment if comment else self._generate_rule_based_comment(function_info, language)
+            return comment if comment else None
             
         except Exception as e:
             print(f"Error generating AI comment: {e}")
-            return self._generate_rule_based_comment(function_info, language)
+            return None
+    
+    def _prompt_prefix(self, language: str, func_type: str) -> str:
+        """Get the fixed part of the prompt shared by every name of this kind."""
+        return f"Generate a {language} {func_type} comment for"
+    
+    def _generate_with_cached_prefix(self, prompt: str, language: str, func_type: str) -> str:
+        """Run model.generate directly, reusing the token ids of the prompt prefix."""
+        key = (language, func_type)
+        prefix_ids = self._prompt_prefix_ids.get(key)
+        if prefix_ids is None:
+            prefix_ids = self.tokenizer(self._prompt_prefix(language, func_type))['input_ids']
+            self._prompt_prefix_ids[key] = prefix_ids
+        
+        # The tail starts with a space, so it tokenizes independently of the prefix
+        tail = prompt[len(self._prompt_prefix(language, func_type)):]
+        tail_ids = self.tokenizer(tail, add_special_tokens=False)['input_ids']
+        
+        ids = prefix_ids + tail_ids
+        mask = [1] * len(ids)
+        if self.compile:
+            # Left-pad to a fixed bucket so the compiled graph is reused across prompts
+            pad = _bucket_length(len(ids)) - len(ids)
+            ids = [self.tokenizer.pad_token_id] * pad + ids
+            mask = [0] * pad + mask
+        
+        input_ids = torch.tensor([ids], device=self.model.device)
+        with torch.inference_mode():
+            output_ids = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=torch.tensor([mask], device=self.model.device),
+                max_new_tokens=self.max_tokens,
+                num_return_sequences=1,
+                **self._sampling_kwargs(),
+                pad_token_id=self.tokenizer.eos_token_id
+            )
+        
+        new_tokens = output_ids[0][input_ids.shape[1]:]
+        return prompt + self.tokenizer.decode(new_tokens, skip_special_tokens=True)
     
     def _create_prompt(self, name: str, func_type: str, language: str, context: str) -> str:
         """Create a prompt for the AI model."""
-        base_prompt = f"Generate a {language} {func_type} comment for '{name}'"
+        base_prompt = f"{self._prompt_prefix(language, func_type)} '{name}'"
         
         if context:
             base_prompt += f" with context: {context[:200]}..."
         
-        if language == 'python':
-            base_prompt += ". Use docstring format with triple quotes."
-        elif language in ['javascript', 'typescript']:
-            base_prompt += ". Use JSDoc format with /** */."
-        elif language in ['java', 'cpp', 'c']:
-            base_prompt += ". Use JavaDoc format with /** */."
-        elif language == 'go':
-            base_prompt += ". Use Go comment format with //."
-        elif language == 'rust':
-            base_prompt += ". Use Rust documentation format with ///."
-        
-        return base_prompt
+        return base_prompt + _FORMAT_HINTS.get(language, "")
     
     def _extract_comment_from_generated(self, generated_text: str, prompt: str, language: str) -> str:
         """Extract the comment from generated text."""
-        # Remove the prompt from generated text
-        comment = generated_text.replace(prompt, "").strip()
-        
-        # Clean up the comment based on language
-        if language == 'python':
-            # Ensure it starts with """
-            if not comment.startswith('"""'):
-                comment = '"""\n    ' + comment
-            if not comment.endswith('"""'):
-                comment += '\n    """'
-        
-        elif language in ['javascript', 'typescript', 'java', 'cpp', 'c']:
-            # Ensure it starts with /**
-            if not comment.startswith('/**'):
-                comment = '/**\n * ' + comment
-            if not comment.endswith('*/'):
-                comment += '\n */'
-        
-        elif language == 'go':
-            # Ensure it starts with //
-            if not comment.startswith('//'):
-                comment = '// ' + comment
-        
-        elif language == 'rust':
-            # Ensure it starts with ///
-            if not comment.startswith('///'):
-                comment = '/// ' + comment
+        # Generation echoes the prompt first, so slice it off instead of searching
+        if generated_text.startswith(prompt):
+            comment = generated_text[len(prompt):].strip()
+        else:
+            comment = generated_text.replace(prompt, "").strip()
+        
+        # Wrap the comment in the language's delimiters if the model left them out
+        opener, closer, start_marker, end_marker = _COMMENT_WRAP.get(language, _NO_WRAP)
+        if not comment.startswith(start_marker):
+            comment = opener + comment
+        if end_marker and not comment.endswith(end_marker):
+            comment += closer
         
         return comment
     
     def generate_comment(self, function_info: Dict, language: str, context: str = "") -> str:
         """Generate a comment for a function or class."""
-        return self._generate_ai_comment(function_info, language, context)
+        key = self._memo_key(function_info, language, context)
+        comment = self._lookup(key)
+        if comment is None:
+            comment = self._generate_model_comment(function_info, language, context)
+            if comment is not None:
+                self._remember(key, comment)
+            else:
+                comment = self._generate_rule_based_comment(function_info, language)
+                self._remember(key, comment, persist=False)
+        return comment
+    
+    def _memo_key(self, function_info: Dict, language: str, context: str = "") -> tuple:
+        """Build the memoization key for a generated comment."""
+        # Only the first 200 characters of context reach the prompt; fingerprinted
+        # rather than hash()ed so the key is stable across processes
+        return (function_info['name'], function_info['type'], language, fingerprint(context[:200]))
+    
+    def _lookup(self, key: tuple) -> Optional[str]:
+        """Get a generated comment from the memo or the on-disk cache."""
+        comment = self._memo.get(key)
+        if comment is None and self._cache is not None:
+            comment = self._cache.get(fingerprint(self.model_name, str(self.max_tokens), *key))
+            if comment is not None:
+                self._memo[key] = comment
+        return comment
+    
+    def _remember(self, key: tuple, comment: str, persist: bool = True):
+        """Store a generated comment in the memo and, if persist, the on-disk cache."""
+        self._memo[key] = comment
+        # Rule-based fallbacks are never persisted, or one transient model error
+        # would pin a TODO template for that signature across future runs
+        if persist and self._cache is not None:
+            self._cache.put(fingerprint(self.model_name, str(self.max_tokens), *key), comment)
+            self._cache.flush()
     
     def generate_comments_batch(self, functions: List[Dict], language: str) -> Dict[str, str]:
         """Generate comments for multiple functions."""
-        comments = {}
+        if not self.pipeline or not functions:
+            return {f['name']: self.generate_comment(f, language) for f in functions}
         
+        # Serve repeated signatures from the memo and only batch the new ones
+        comments = {}
+        pending = {}
         for func_info in functions:
-            name = func_info['name']
-            comment = self.generate_comment(func_info, language)
-            comments[name] = comment
+            key = self._memo_key(func_info, language)
+            comment = self._lookup(key)
+            if comment is not None:
+                comments[func_info['name']] = comment
+            else:
+                pending.setdefault(key, func_info)
+        
+        if not pending:
+            return comments
+        
+        # Order prompts by length so each batch pads its prompts to a similar length
+        prompt_for = {key: self._create_prompt(f['name'], f['type'], language, "") for key, f in pending.items()}
+        keys = sorted(pending, key=lambda key: len(prompt_for[key]))
+        functions = [pending[key] for key in keys]
+        prompts = [prompt_for[key] for key in keys]
+        
+        try:
+            # One batched forward pass instead of a pipeline call per function
+            with torch.inference_mode():
+                outputs = self.pipeline(
+                    prompts,
+                    batch_size=min(len(prompts), 16),
+                    max_new_tokens=self.max_tokens,
+                    num_return_sequences=1,
+                    **self._sampling_kwargs(),
+                    pad_token_id=self.tokenizer.eos_token_id
+                )
+        except Exception as e:
+            print(f"Error generating AI comments in batch: {e}")
+            for func_info in functions:
+                comments[func_info['name']] = self._generate_rule_based_comment(func_info, language)
+            return comments
+        
+        for key, func_info, prompt, output in zip(keys, functions, prompts, outputs):
+            comment = self._extract_comment_from_generated(output[0]['generated_text'], prompt, language)
+            if comment:
+                self._remember(key, comment)
+            else:
+                comment = self._generate_rule_based_comment(func_info, language)
+                self._remember(key, comment, persist=False)
+            comments[func_info['name']] = comment
         
         return comments
@@ -2,13 +2,141 @@
 Code analyzer module for detecting undocumented functions and classes.
 """
 
+import bisect
+import fnmatch
+import mmap
 import os
+import queue
 import re
-from typing import List, Dict, Tuple, Optional
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, Union
 import tree_sitter
 from tree_sitter import Language, Parser
-import yaml
+
+from ._cache import ResultCache, fingerprint
+from ._config import ignored_dir_names, load_config, walk_ignore_patterns
+from ._lang import EXT_TO_LANG
+from ._source import COMMENT_LINE_PREFIXES, FUNC_REGEXES, iter_source_files, newline_offsets, prev_lines
+
+
+# Compiled regexes for each comment marker in the config's comment_patterns
+_COMMENT_REGEXES = {
+    '//': re.compile(r'//.*$', re.MULTILINE),  # Single line comments
+    '/*': re.compile(r'/\*.*?\*/', re.DOTALL),  # Multi-line comments
+    '#': re.compile(r'#.*$', re.MULTILINE),  # Python-style comments
+    '"""': re.compile(r'""".*?"""', re.DOTALL),  # Python docstrings
+    "'''": re.compile(r"'''.*?'''", re.DOTALL),  # Python docstrings
+}
+
+_NO_DOC_MARKERS = ((), ())
+
+
+def _doc_markers(patterns: List[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split comment patterns into line prefixes and substrings that mark documentation."""
+    prefixes = []
+    markers = []
+    for pattern in patterns:
+        if pattern in ('//', '#'):
+            prefixes.append(pattern)
+        elif pattern == '/*':
+            markers.extend(('/*', '*/'))
+        elif pattern in ('"""', "'''"):
+            markers.append(pattern)
+    return tuple(prefixes), tuple(markers)
+
+
+# Tree-sitter query patterns for documentable definitions; each grammar only
+# supports some of these node types, so they are compiled one by one
+_DEFINITION_QUERIES = (
+    "(function_definition name: (identifier)) @def",
+    "(class_definition name: (identifier)) @def",
+    "(method_definition name: (property_identifier)) @def",
+)
+# Definition type reported for each node type the queries above capture
+_DEFINITION_NODE_TYPES = {
+    'function_definition': 'function',
+    'method_definition': 'function',
+    'class_definition': 'class',
+}
+
+
+def _build_definition_query(lang):
+    """Compile a query matching the definition node types this grammar has."""
+    patterns = []
+    for pattern in _DEFINITION_QUERIES:
+        try:
+            lang.query(pattern)
+        except Exception:
+            # Node type or field doesn't exist in this grammar
+            continue
+        patterns.append(pattern)
+    return lang.query('\n'.join(patterns)) if patterns else None
+
+
+# Files at least this large are memory-mapped for tree-sitter instead of read
+_MMAP_THRESHOLD = 256 * 1024
+
+# Threads reading files for analyze_directory, so several reads are in flight at once
+_READER_THREADS = 4
+
+# Tree-sitter language libraries, each loaded only once a file needs it
+_LANGUAGE_LIBRARIES = {
+    'python': 'tree_sitter_python',
+    'javascript': 'tree_sitter_javascript',
+    'typescript': 'tree_sitter_typescript',
+    'java': 'tree_sitter_java',
+    'cpp': 'tree_sitter_cpp',
+    'c': 'tree_sitter_c',
+    'go': 'tree_sitter_go',
+    'rust': 'tree_sitter_rust',
+}
+
+
+@lru_cache(maxsize=None)
+def _load_language(lang_name: str) -> Optional[Tuple[Language, object]]:
+    """Load a tree-sitter language and its definition query, or None if unavailable."""
+    library = _LANGUAGE_LIBRARIES.get(lang_name)
+    if library is None:
+        return None
+    
+    try:
+        # Try to load language library - fixed constructor call
+        lang = tree_sitter.Language(library)
+        return lang, _build_definition_query(lang)
+    except Exception as e:
+        # Fallback to regex-based analysis for this language
+        print(f"Warning: Could not load tree-sitter parser for {lang_name}: {e}")
+        return None
+
+
+# Parsers keep per-parse state, so each thread gets its own set
+_thread_local = threading.local()
+
+# Serializes first loads so concurrent readers don't load a language twice
+_load_lock = threading.Lock()
+
+
+def _get_parser(lang_name: str) -> Optional[Parser]:
+    """Get the calling thread's parser for a language, creating it on first use."""
+    parsers = getattr(_thread_local, 'parsers', None)
+    if parsers is None:
+        parsers = _thread_local.parsers = {}
+    
+    if lang_name not in parsers:
+        parser = None
+        with _load_lock:
+            loaded = _load_language(lang_name)
+        if loaded is not None:
+            try:
+                parser = Parser()
+                parser.set_language(loaded[0])
+            except Exception as e:
+                print(f"Warning: Could not load tree-sitter parser for {lang_name}: {e}")
+                parser = None
+        parsers[lang_name] = parser
+    return parsers[lang_name]
 
 
 class CodeAnalyzer:
@@ -16,180 +144,102 @@ class CodeAnalyzer:
     
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize the analyzer with configuration."""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         self.supported_languages = self.config['code_analysis']['supported_languages']
         self.comment_patterns = self.config['code_analysis']['comment_patterns']
         self.ignore_patterns = self.config['code_analysis']['ignore_patterns']
+        # All ignore globs translated once into a single alternation
+        self._ignore_re = re.compile(
+            '|'.join(f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in self.ignore_patterns)
+        ) if self.ignore_patterns else None
+        self._ignore_dir_names = ignored_dir_names(self.ignore_patterns)
+        # What the walk still has to match once those directories are pruned by name
+        walk_patterns = walk_ignore_patterns(self.ignore_patterns)
+        self._walk_ignore_re = re.compile(
+            '|'.join(f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in walk_patterns)
+        ) if walk_patterns else None
         
-        # Initialize tree-sitter parsers
-        self.parsers = {}
-        self._setup_parsers()
+        # Per-language comment regexes and documentation markers, resolved once
+        self._comment_regexes = {
+            lang: tuple(_COMMENT_REGEXES[p] for p in patterns if p in _COMMENT_REGEXES)
+            for lang, patterns in self.comment_patterns.items()
+        }
+        self._doc_markers = {
+            lang: _doc_markers(patterns) for lang, patterns in self.comment_patterns.items()
+        }
+        
+        # Optional on-disk cache of results for file contents already analyzed
+        cache_path = self.config['code_analysis'].get('cache')
+        self._cache = ResultCache(cache_path, 'analysis') if cache_path else None
     
-    def _setup_parsers(self):
-        """Setup tree-sitter parsers for supported languages."""
-        try:
-            # Try to load language libraries - fixed constructor calls
-            languages = {
-                'python': tree_sitter.Language('tree_sitter_python'),
-                'javascript': tree_sitter.Language('tree_sitter_javascript'),
-                'typescript': tree_sitter.Language('tree_sitter_typescript'),
-                'java': tree_sitter.Language('tree_sitter_java'),
-                'cpp': tree_sitter.Language('tree_sitter_cpp'),
-                'c': tree_sitter.Language('tree_sitter_c'),
-                'go': tree_sitter.Language('tree_sitter_go'),
-                'rust': tree_sitter.Language('tree_sitter_rust'),
-            }
-            
-            for lang_name, lang in languages.items():
-                parser = Parser()
-                parser.set_language(lang)
-                self.parsers[lang_name] = parser
-                
-        except Exception as e:
-            print(f"Warning: Could not load all tree-sitter parsers: {e}")
-            # Fallback to regex-based analysis
-            self.parsers = {}
+    def close(self):
+        """Close the analysis cache, if one is configured."""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
     
     def _get_language_from_extension(self, file_path: str) -> Optional[str]:
         """Determine language from file extension."""
-        ext = Path(file_path).suffix.lower()
-        ext_to_lang = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.jsx': 'javascript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-        }
-        return ext_to_lang.get(ext)
+        return EXT_TO_LANG.get(os.path.splitext(file_path)[1].lower())
     
     def _should_ignore_file(self, file_path: str) -> bool:
         """Check if file should be ignored based on patterns."""
-        for pattern in self.ignore_patterns:
-            if self._matches_pattern(file_path, pattern):
-                return True
-        return False
-    
-    def _matches_pattern(self, file_path: str, pattern: str) -> bool:
-        """Check if file path matches ignore pattern."""
-        import fnmatch
-        return fnmatch.fnmatch(file_path, pattern)
+        # Same matching as fnmatch.fnmatch, with every pattern tried in one regex pass
+        if self._ignore_re is None:
+            return False
+        return self._ignore_re.match(os.path.normcase(file_path)) is not None
     
     def _extract_comments_regex(self, content: str, language: str) -> List[Tuple[int, int, str]]:
         """Extract comments using regex patterns."""
         comments = []
-        patterns = self.comment_patterns.get(language, [])
         
-        for pattern in patterns:
-            if pattern == "//":
-                # Single line comments
-                for match in re.finditer(r'//.*$', content, re.MULTILINE):
-                    comments.append((match.start(), match.end(), match.group()))
-            elif pattern == "/*":
-                # Multi-line comments
-                for match in re.finditer(r'/\*.*?\*/', content, re.DOTALL):
-                    comments.append((match.start(), match.end(), match.group()))
-            elif pattern == "#":
-                # Python-style comments
-                for match in re.finditer(r'#.*$', content, re.MULTILINE):
-                    comments.append((match.start(), match.end(), match.group()))
-            elif pattern == '"""':
-                # Python docstrings
-                for match in re.finditer(r'""".*?"""', content, re.DOTALL):
-                    comments.append((match.start(), match.end(), match.group()))
-            elif pattern == "'''":
-                # Python docstrings
-                for match in re.finditer(r"'''.*?'''", content, re.DOTALL):
-                    comments.append((match.start(), match.end(), match.group()))
+        for regex in self._comment_regexes.get(language, ()):
+            for match in regex.finditer(content):
+                comments.append((match.start(), match.end(), match.group()))
         
         return comments
     
     def _find_undocumented_functions_regex(self, content: str, language: str) -> List[Dict]:
         """Find undocumented functions using regex patterns."""
         undocumented = []
+        newlines = None
         
-        if language == 'python':
-            # Python function patterns
-            function_patterns = [
-                r'def\s+(\w+)\s*\(',
-                r'class\s+(\w+)\s*[\(:]',
-            ]
-            
-            for pattern in function_patterns:
-                for match in re.finditer(pattern, content):
-                    func_name = match.group(1)
-                    start_pos = match.start()
-                    
-                    # Check if there's a comment/docstring before this function
-                    has_doc = self._has_documentation_before(content, start_pos, language)
-                    if not has_doc:
-                        undocumented.append({
-                            'name': func_name,
-                            'type': 'function' if 'def' in pattern else 'class',
-                            'line': content[:start_pos].count('\n') + 1,
-                            'position': start_pos
-                        })
-        
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript function patterns
-            function_patterns = [
-                r'function\s+(\w+)\s*\(',
-                r'const\s+(\w+)\s*=\s*\(',
-                r'let\s+(\w+)\s*=\s*\(',
-                r'var\s+(\w+)\s*=\s*\(',
-                r'(\w+)\s*:\s*function',
-                r'class\s+(\w+)\s*[{\s]',
-            ]
-            
-            for pattern in function_patterns:
-                for match in re.finditer(pattern, content):
-                    func_name = match.group(1)
-                    start_pos = match.start()
-                    
-                    has_doc = self._has_documentation_before(content, start_pos, language)
-                    if not has_doc:
-                        undocumented.append({
-                            'name': func_name,
-                            'type': 'function' if 'function' in pattern or '=' in pattern else 'class',
-                            'line': content[:start_pos].count('\n') + 1,
-                            'position': start_pos
-                        })
+        for regex, func_type in FUNC_REGEXES.get(language, []):
+            for match in regex.finditer(content):
+                func_name = match.group(1)
+                start_pos = match.start()
+                
+                # Check if there's a comment/docstring before this function
+                has_doc = self._has_documentation_before(content, start_pos, language)
+                if not has_doc:
+                    if newlines is None:
+                        newlines = newline_offsets(content)
+                    undocumented.append({
+                        'name': func_name,
+                        'type': func_type,
+                        # Newlines before start_pos, found by bisection instead of rescanning the prefix
+                        'line': bisect.bisect_left(newlines, start_pos) + 1,
+                        'position': start_pos
+                    })
         
         return undocumented
     
     def _has_documentation_before(self, content: str, position: int, language: str) -> bool:
         """Check if there's documentation before the given position."""
-        before_content = content[:position]
-        lines = before_content.split('\n')
+        prefixes, markers = self._doc_markers.get(language, _NO_DOC_MARKERS)
         
         # Look at the last few lines before the position
-        for line in reversed(lines[-5:]):
-            line = line.strip()
+        for line in prev_lines(content, position, 5):
             if not line:
                 continue
             
             # Check for comment patterns
-            comment_patterns = self.comment_patterns.get(language, [])
-            for pattern in comment_patterns:
-                if pattern == "//" and line.startswith('//'):
-                    return True
-                elif pattern == "/*" and ('/*' in line or '*/' in line):
-                    return True
-                elif pattern == "#" and line.startswith('#'):
-                    return True
-                elif pattern in ['"""', "'''"] and (pattern in line):
-                    return True
+            if line.startswith(prefixes) or any(marker in line for marker in markers):
+                return True
             
             # If we hit non-empty, non-comment code, stop looking
-            if line and not any(line.startswith(p) for p in ['//', '#', '/*', '*']):
+            if line and not line.startswith(COMMENT_LINE_PREFIXES):
                 break
         
         return False
@@ -203,86 +253,180 @@ class CodeAnalyzer:
         if not language or language not in self.supported_languages:
             return []
         
+        content = self._read_source(file_path, language)
+        if content is None:
+            return []
+        undocumented = self._analyze_source(content, language, file_path)
+        if self._cache is not None:
+            self._cache.flush()
+        return undocumented
+    
+    def _read_source(self, file_path: str, language: str) -> Optional[Union[str, bytes, mmap.mmap]]:
+        """Read a file as bytes for tree-sitter or as text for the regex fallback."""
+        # Only languages actually encountered get loaded; parsers are created by the consumer
+        with _load_lock:
+            use_tree_sitter = _load_language(language) is not None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read raw bytes: tree-sitter parses them directly, only the regex path needs text
+            with open(file_path, 'rb') as f:
+                if use_tree_sitter and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+                    # Large file: tree-sitter reads the mapped pages without a heap copy
+                    content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    content = f.read()
+            if not use_tree_sitter:
+                content = content.decode('utf-8')
         except Exception as e:
             print(f"Error reading file {file_path}: {e}")
-            return []
+            return None
+        return content
+    
+    def _analyze_source(self, content: Union[str, bytes, mmap.mmap], language: str, file_path: str) -> List[Dict]:
+        """Analyze source returned by _read_source, reusing cached results for unchanged content."""
+        if self._cache is None:
+            return self._analyze_content(content, language, file_path)
         
+        # Results depend only on the content, the language, the parse mode and its comment patterns
+        mode = 'regex' if isinstance(content, str) else 'tree-sitter'
+        key = fingerprint(language, mode, repr(self.comment_patterns.get(language)), content)
+        undocumented = self._cache.get(key)
+        if undocumented is None:
+            undocumented = self._analyze_content(content, language, file_path)
+            self._cache.put(key, undocumented)
+            return undocumented
+        
+        if isinstance(content, mmap.mmap):
+            content.close()
+        # The same content may have been cached under another path
+        for entry in undocumented:
+            if 'file' in entry:
+                entry['file'] = file_path
+        return undocumented
+    
+    def _analyze_content(self, content: Union[str, bytes, mmap.mmap], language: str, file_path: str) -> List[Dict]:
+        """Analyze source with tree-sitter or the regex fallback."""
         # Use tree-sitter if available, otherwise fallback to regex
-        if language in self.parsers:
-            return self._analyze_with_tree_sitter(content, language, file_path)
-        else:
+        if isinstance(content, str):
             return self._find_undocumented_functions_regex(content, language)
+        try:
+            return self._analyze_with_tree_sitter(content, language, file_path)
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
     
-    def _analyze_with_tree_sitter(self, content: str, language: str, file_path: str) -> List[Dict]:
+    def _analyze_with_tree_sitter(self, content: Union[bytes, mmap.mmap], language: str, file_path: str) -> List[Dict]:
         """Analyze code using tree-sitter parser."""
-        parser = self.parsers[language]
-        tree = parser.parse(bytes(content, 'utf8'))
+        query = _load_language(language)[1]
+        if query is None:
+            return []
+        
+        parser = _get_parser(language)
+        if parser is None:
+            return self._find_undocumented_functions_regex(bytes(content).decode('utf-8', 'replace'), language)
+        tree = parser.parse(content)
         
         undocumented = []
         
-        def traverse_node(node, depth=0):
-            if node.type in ['function_definition', 'class_definition', 'method_definition']:
-                # Check if this function/class has documentation
-                has_doc = self._check_node_documentation(node, content)
-                if not has_doc:
-                    name = self._extract_node_name(node, content)
-                    if name:
-                        undocumented.append({
-                            'name': name,
-                            'type': 'function' if 'function' in node.type else 'class',
-                            'line': node.start_point[0] + 1,
-                            'position': node.start_byte,
-                            'file': file_path
-                        })
-            
-            for child in node.children:
-                traverse_node(child, depth + 1)
+        for definition, _ in query.captures(tree.root_node):
+            # Check if this function/class has documentation
+            if not self._check_node_documentation(definition, content):
+                undocumented.append({
+                    'name': self._extract_node_name(definition, content),
+                    'type': _DEFINITION_NODE_TYPES[definition.type],
+                    'line': definition.start_point[0] + 1,
+                    'position': definition.start_byte,
+                    'file': file_path
+                })
         
-        traverse_node(tree.root_node)
         return undocumented
     
-    def _check_node_documentation(self, node, content: str) -> bool:
+    def _extract_node_name(self, node, content: Union[bytes, mmap.mmap]) -> Optional[str]:
+        """Extract the name from a tree-sitter node."""
+        # The grammar's name field is looked up in C, no walk over the children
+        name_node = node.child_by_field_name('name')
+        if name_node is None:
+            return None
+        return content[name_node.start_byte:name_node.end_byte].decode('utf-8', 'replace')
+    
+    def _check_node_documentation(self, node, content: Union[bytes, mmap.mmap]) -> bool:
         """Check if a node has documentation."""
         # Look for docstrings or comments before the node
-        start_byte = node.start_byte
-        before_content = content[:start_byte]
-        
         # Check last few lines for comments/docstrings
-        lines = before_content.split('\n')
-        for line in reversed(lines[-3:]):
-            line = line.strip()
-            if line.startswith('#') or line.startswith('//') or '"""' in line or "'''" in line:
+        for line in prev_lines(content, node.start_byte, 3):
+            if line.startswith(('#', '//')) or '"""' in line or "'''" in line:
                 return True
-            if line and not line.startswith(('//', '#', '/*', '*')):
+            if line and not line.startswith(COMMENT_LINE_PREFIXES):
                 break
         
         return False
     
-    def _extract_node_name(self, node, content: str) -> Optional[str]:
-        """Extract the name from a tree-sitter node."""
-        for child in node.children:
-            if child.type == 'identifier':
-                start_byte = child.start_byte
-                end_byte = child.end_byte
-                return content[start_byte:end_byte]
-        return None
+    def _iter_source_files(self, directory: str):
+        """Yield paths of analyzable source files under a directory, pruning ignored dirs."""
+        return iter_source_files(
+            directory, self._ignore_re, self._walk_ignore_re, self._ignore_dir_names,
+            lambda name: self._get_language_from_extension(name) in self.supported_languages
+        )
     
     def analyze_directory(self, directory: str) -> Dict[str, List[Dict]]:
         """Analyze all files in a directory."""
-        results = {}
+        # Reader threads pull paths off one walk and read files into a bounded queue
+        # while workers parse them; several reads in flight keep the disk queue busy
+        workers = os.cpu_count() or 1
+        sources = queue.Queue(maxsize=64)
+        walk = self._iter_source_files(directory)
+        walk_lock = threading.Lock()
+        readers_left = _READER_THREADS
+        file_paths = []
+        found = {}
+        errors = []
         
-        for root, dirs, files in os.walk(directory):
-            # Remove ignored directories
-            dirs[:] = [d for d in dirs if not self._should_ignore_file(os.path.join(root, d))]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                if not self._should_ignore_file(file_path):
-                    undocumented = self.analyze_file(file_path)
-                    if undocumented:
-                        results[file_path] = undocumented
+        def produce():
+            nonlocal readers_left
+            try:
+                while True:
+                    with walk_lock:
+                        file_path = next(walk, None)
+                        if file_path is None:
+                            return
+                        file_paths.append(file_path)
+                    language = self._get_language_from_extension(file_path)
+                    content = self._read_source(file_path, language)
+                    if content is not None:
+                        sources.put((file_path, language, content))
+            finally:
+                with walk_lock:
+                    readers_left -= 1
+                    last = readers_left == 0
+                if last:
+                    for _ in range(workers):
+                        sources.put(None)
+        
+        def consume():
+            while True:
+                item = sources.get()
+                if item is None:
+                    return
+                file_path, language, content = item
+                try:
+                    found[file_path] = self._analyze_source(content, language, file_path)
+                except Exception as e:
+                    # Keep draining the queue so the producer never blocks on a full queue
+                    errors.append(e)
+        
+        with ThreadPoolExecutor(max_workers=workers + _READER_THREADS) as executor:
+            futures = [executor.submit(produce) for _ in range(_READER_THREADS)]
+            futures += [executor.submit(consume) for _ in range(workers)]
+            for future in futures:
+                future.result()
+        if self._cache is not None:
+            self._cache.flush()
+        if errors:
+            raise errors[0]
+        
+        # Report files in walk order regardless of which worker finished first
+        results = {}
+        for file_path in file_paths:
+            if found.get(file_path):
+                results[file_path] = found[file_path]
         
         return results
@@ -4,11 +4,48 @@ GitHub integration module for creating pull requests with generated documentatio
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from github import Github, GithubException
 from git import Repo, InvalidGitRepositoryError
-import yaml
-from pathlib import Path
+
+from ._config import load_config
+from ._lang import EXT_TO_LANG
+
+
+# owner/repo from an HTTPS (github.com/) or SSH (github.com:) remote URL
+_GITHUB_URL_RE = re.compile(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?$')
+
+
+def _line_starts(content: str) -> List[int]:
+    """Get the offset where each line of the content starts."""
+    starts = [0]
+    pos = content.find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return starts
+
+
+def _insert_lines(content: str, starts: List[int], insertions: List[Tuple[int, str]]) -> str:
+    """Insert texts as new lines before 0-based lines of the original content, in one pass.
+    
+    Lines past the end are appended. Texts for the same line keep their given order.
+    """
+    pieces = []
+    prev = 0
+    appended = []
+    for index, text in sorted(insertions, key=lambda insertion: insertion[0]):
+        if index >= len(starts):
+            appended.append('\n' + text)
+            continue
+        offset = starts[index]
+        pieces.append(content[prev:offset])
+        pieces.append(text + '\n')
+        prev = offset
+    pieces.append(content[prev:])
+    pieces.extend(appended)
+    return ''.join(pieces)
 
 
 class GitHubIntegration:
@@ -16,8 +53,7 @@ class GitHubIntegration:
     
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize GitHub integration with configuration."""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         self.github_config = self.config['github']
         self.token_env = self.github_config['token_env']
@@ -51,11 +87,8 @@ class GitHubIntegration:
             
             # Extract owner/repo from URL
             if 'github.com' in remote_url:
-                # Handle both HTTPS and SSH URLs
-                if remote_url.startswith('https://'):
-                    match = re.search(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?$', remote_url)
-                else:  # SSH
-                    match = re.search(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?$', remote_url)
+                # Handles both HTTPS and SSH URLs
+                match = _GITHUB_URL_RE.search(remote_url)
                 
                 if match:
                     owner, repo_name = match.groups()
@@ -76,62 +109,55 @@ class GitHubIntegration:
     
     def _apply_comment_to_file(self, file_path: str, function_info: Dict, comment: str, language: str) -> bool:
         """Apply generated comment to a file."""
+        return self._apply_comments_to_file(file_path, [(function_info, comment)], language) > 0
+    
+    def _apply_comments_to_file(self, file_path: str, insertions: List[Tuple[Dict, str]], language: str) -> int:
+        """Apply several generated comments to a file with a single read and write.
+        
+        Line numbers refer to the file as analyzed. Returns the number of comments applied.
+        """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Find the position to insert the comment
-            position = function_info['position']
-            line_num = function_info['line']
-            
-            # Split content into lines
-            lines = content.split('\n')
-            
-            # Insert comment before the function/class
-            if language == 'python':
-                # For Python, insert docstring right after the definition line
-                if function_info['type'] == 'function':
-                    # Find the end of the function definition line
-                    def_line = lines[line_num - 1]
-                    if ':' in def_line:
-                        # Insert after the colon
-                        indent = len(def_line) - len(def_line.lstrip())
-                        comment_lines = [comment]
-                        comment_lines[0] = ' ' * (indent + 4) + comment_lines[0]
-                        for i in range(1, len(comment_lines)):
-                            comment_lines[i] = ' ' * (indent + 4) + comment_lines[i]
-                        
-                        lines.insert(line_num, '\n'.join(comment_lines))
-                    else:
-                        lines.insert(line_num, comment)
-                else:  # class
-                    lines.insert(line_num, comment)
-            
-            elif language in ['javascript', 'typescript']:
-                # For JS/TS, insert JSDoc comment before the function/class
-                lines.insert(line_num - 1, comment)
-            
-            elif language in ['java', 'cpp', 'c']:
-                # For Java/C++, insert JavaDoc comment before the function/class
-                lines.insert(line_num - 1, comment)
-            
-            elif language == 'go':
-                # For Go, insert comment before the function/struct
-                lines.insert(line_num - 1, comment)
+            starts = _line_starts(content)
+            edits = []
+            for function_info, comment in insertions:
+                # Find the position to insert the comment
+                line_num = function_info['line']
+                
+                # Insert comment before the function/class
+                if language == 'python':
+                    # For Python, insert docstring right after the definition line
+                    if function_info['type'] == 'function':
+                        if line_num > len(starts):
+                            print(f"Error applying comment to {file_path}: line {line_num} is past the end of the file")
+                            continue
+                        # Find the end of the function definition line
+                        def_end = starts[line_num] - 1 if line_num < len(starts) else len(content)
+                        def_line = content[starts[line_num - 1]:def_end]
+                        if ':' in def_line:
+                            # Insert after the colon
+                            indent = len(def_line) - len(def_line.lstrip())
+                            comment = ' ' * (indent + 4) + comment
+                    edits.append((line_num, comment))
+                
+                elif language in ['javascript', 'typescript', 'java', 'cpp', 'c', 'go', 'rust']:
+                    # Insert JSDoc/JavaDoc/Go/Rust doc comment before the function/class
+                    edits.append((line_num - 1, comment))
             
-            elif language == 'rust':
-                # For Rust, insert documentation comment before the function/struct
-                lines.insert(line_num - 1, comment)
+            if not edits:
+                return 0
             
             # Write the modified content back
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(lines))
+                f.write(_insert_lines(content, starts, edits))
             
-            return True
+            return len(edits)
             
         except Exception as e:
             print(f"Error applying comment to {file_path}: {e}")
-            return False
+            return 0
     
     def _create_commit_message(self, files_modified: List[str], functions_documented: int) -> str:
         """Create a commit message for the documentation changes."""
@@ -152,19 +178,29 @@ class GitHubIntegration:
             files_modified = []
             functions_documented = 0
             
+            jobs = []
             for file_path, functions in analysis_results.items():
                 if file_path in comments:
                     file_comments = comments[file_path]
                     language = self._get_language_from_file(file_path)
                     
-                    for func_info in functions:
-                        func_name = func_info['name']
-                        if func_name in file_comments:
-                            comment = file_comments[func_name]
-                            if self._apply_comment_to_file(file_path, func_info, comment, language):
-                                functions_documented += 1
-                                if file_path not in files_modified:
-                                    files_modified.append(file_path)
+                    # All of a file's comments go in with one read and one write
+                    insertions = [
+                        (func_info, file_comments[func_info['name']])
+                        for func_info in functions
+                        if func_info['name'] in file_comments
+                    ]
+                    jobs.append((file_path, insertions, language))
+            
+            # Files are edited independently, so their disk I/O can overlap
+            if jobs:
+                with ThreadPoolExecutor(max_workers=min(len(jobs), (os.cpu_count() or 1) * 2)) as executor:
+                    applied_counts = list(executor.map(lambda job: self._apply_comments_to_file(*job), jobs))
+                
+                for (file_path, _, _), applied in zip(jobs, applied_counts):
+                    if applied:
+                        functions_documented += applied
+                        files_modified.append(file_path)
             
             if not files_modified:
                 print("No files were modified. Skipping PR creation.")
@@ -175,15 +211,19 @@ class GitHubIntegration:
             commit_message = self._create_commit_message(files_modified, functions_documented)
             repo.index.commit(commit_message)
             
-            # Push branch
+            # Push branch in the background while the PR is prepared
             origin = repo.remotes.origin
-            origin.push(new_branch)
-            
-            # Create pull request
-            pr_title = f"{self.pr_title_prefix} {functions_documented} functions/classes"
-            pr_body = self.pr_body_template.format(
-                files_modified='\n'.join(f"- {f}" for f in files_modified)
-            )
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                push = executor.submit(origin.push, new_branch)
+                
+                # Create pull request
+                pr_title = f"{self.pr_title_prefix} {functions_documented} functions/classes"
+                pr_body = self.pr_body_template.format(
+                    files_modified='\n'.join(f"- {f}" for f in files_modified)
+                )
+                
+                # The branch must exist on the remote before the PR can reference it
+                push.result()
             
             pr = self.repo.create_pull(
                 title=pr_title,
@@ -201,22 +241,7 @@ class GitHubIntegration:
     
     def _get_language_from_file(self, file_path: str) -> str:
         """Get language from file extension."""
-        ext = Path(file_path).suffix.lower()
-        ext_to_lang = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.jsx': 'javascript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-        }
-        return ext_to_lang.get(ext, 'python')
+        return EXT_TO_LANG.get(os.path.splitext(file_path)[1].lower(), 'python')
     
     def create_dry_run_summary(self, analysis_results: Dict[str, List[Dict]], comments: Dict[str, Dict[str, str]]) -> str:
         """Create a summary of what would be changed in dry run mode."""
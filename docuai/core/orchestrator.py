@@ -5,16 +5,16 @@ Main orchestrator module that coordinates all DocuAI components.
 import os
 import sys
 from typing import Dict, List, Optional
-from pathlib import Path
-import yaml
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 from rich.panel import Panel
 
 from .analyzer import CodeAnalyzer
-from .ai_generator import AICommentGenerator
+from .ai_generator import get_generator, release_generator
 from .github_integration import GitHubIntegration
+from ._config import load_config
+from ._lang import EXT_TO_LANG
 
 
 class DocuAIOrchestrator:
@@ -26,12 +26,12 @@ class DocuAIOrchestrator:
         self.config_path = config_path
         
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         # Initialize components
         self.analyzer = CodeAnalyzer(config_path)
-        self.ai_generator = AICommentGenerator(config_path)
+        self.ai_generator = get_generator(config_path)
+        self._holds_generator = True
         self.github_integration = None
         
         # Check if GitHub integration is available
@@ -43,15 +43,38 @@ class DocuAIOrchestrator:
         else:
             self.console.print("[yellow]Warning: GitHub token not found. PR creation will be disabled.[/yellow]")
     
+    def close(self):
+        """Release this orchestrator's hold on the comment generator and close the analysis cache."""
+        self._release_generator()
+        self.analyzer.close()
+    
+    def _release_generator(self):
+        """Give back the shared generator, which stays loaded in the registry for later commands."""
+        if self._holds_generator:
+            self._holds_generator = False
+            release_generator(self.ai_generator)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _progress(self) -> Progress:
+        """Create a spinner progress display, disabled when nobody would see it."""
+        # A disabled Progress never starts its refresh thread or probes the terminal
+        return Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=self.console,
+            disable=not self.console.is_terminal or os.getenv('CI', '').lower() not in ('', '0', 'false')
+        )
+    
     def analyze_codebase(self, directory: str = ".") -> Dict[str, List[Dict]]:
         """Analyze the codebase for undocumented functions and classes."""
         self.console.print(f"[blue]Analyzing codebase in: {directory}[/blue]")
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console
-        ) as progress:
+        with self._progress() as progress:
             task = progress.add_task("Scanning files...", total=None)
             
             results = self.analyzer.analyze_directory(directory)
@@ -64,18 +87,31 @@ class DocuAIOrchestrator:
         """Generate comments for all undocumented functions and classes."""
         self.console.print("[blue]Generating AI comments...[/blue]")
         
+        if not self._holds_generator:
+            # Released after an earlier workflow; take a fresh hold on the shared generator
+            self.ai_generator = get_generator(self.config_path)
+            self._holds_generator = True
+        
         all_comments = {}
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console
-        ) as progress:
+        with self._progress() as progress:
             task = progress.add_task("Generating comments...", total=len(analysis_results))
             
+            # Batch each language's functions across all files so the model runs a few
+            # large forward passes; the per-file loop below is then served from the memo
+            languages = {
+                file_path: self._get_language_from_file(file_path)
+                for file_path, functions in analysis_results.items() if functions
+            }
+            by_language = {}
+            for file_path, language in languages.items():
+                by_language.setdefault(language, []).extend(analysis_results[file_path])
+            for language, functions in by_language.items():
+                self.ai_generator.generate_comments_batch(functions, language)
+            
             for file_path, functions in analysis_results.items():
                 if functions:
-                    language = self._get_language_from_file(file_path)
+                    language = languages[file_path]
                     file_comments = {}
                     
                     for func_info in functions:
@@ -90,22 +126,7 @@ class DocuAIOrchestrator:
     
     def _get_language_from_file(self, file_path: str) -> str:
         """Get language from file extension."""
-        ext = Path(file_path).suffix.lower()
-        ext_to_lang = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.jsx': 'javascript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-        }
-        return ext_to_lang.get(ext, 'python')
+        return EXT_TO_LANG.get(os.path.splitext(file_path)[1].lower(), 'python')
     
     def create_pull_request(self, analysis_results: Dict[str, List[Dict]], comments: Dict[str, Dict[str, str]]) -> Optional[str]:
         """Create a pull request with the generated documentation."""
@@ -115,11 +136,7 @@ class DocuAIOrchestrator:
         
         self.console.print("[blue]Creating pull request...[/blue]")
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console
-        ) as progress:
+        with self._progress() as progress:
             task = progress.add_task("Creating PR...", total=None)
             
             pr_url = self.github_integration.create_documentation_pr(analysis_results, comments)
@@ -202,6 +219,8 @@ class DocuAIOrchestrator:
         
         # Step 3: Create pull request or show dry run
         if create_pr and self.github_integration:
+            # Comments are generated, so give the generator back before git and PR upload
+            self._release_generator()
             pr_url = self.create_pull_request(analysis_results, comments)
             if pr_url:
                 self.console.print(f"[green]✅ Pull request created: {pr_url}[/green]")
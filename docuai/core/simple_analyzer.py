@@ -2,10 +2,40 @@
 Simplified code analyzer that doesn't require tree-sitter.
 """
 
+import bisect
+import fnmatch
+import math
 import os
 import re
-from typing import List, Dict, Optional
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple, Union
+
+from ._config import ignored_dir_names, walk_ignore_patterns
+from ._lang import EXT_TO_LANG
+from ._source import COMMENT_LINE_PREFIXES, DOC_LINE_CHECKS, FUNC_REGEXES, iter_source_files, newline_offsets, prev_lines
+
+
+# Header markers of generated files, which nobody documents by hand
+_GENERATED_RE = re.compile(rb'@generated|AUTOGENERATED')
+_GENERATED_HEADER_BYTES = 512
+
+# Files at least this large with fewer newlines than one per this many bytes are minified
+_MINIFIED_MIN_SIZE = 512 * 1024
+_MINIFIED_LINE_LENGTH = 1000
+
+
+def _is_generated(data: bytes) -> bool:
+    """Check whether raw source is generated or minified and not worth scanning."""
+    if _GENERATED_RE.search(data, 0, _GENERATED_HEADER_BYTES):
+        return True
+    return len(data) >= _MINIFIED_MIN_SIZE and data.count(b'\n') < len(data) // _MINIFIED_LINE_LENGTH
+
+
+# Directories with fewer files than this are analyzed in-process
+_PARALLEL_MIN_FILES = 32
+
+# Per-process analyzer used by _analyze_one in pool workers
+_worker_analyzer = None
 
 
 class SimpleAnalyzer:
@@ -23,68 +53,42 @@ class SimpleAnalyzer:
             "**/build/**",
             "**/dist/**"
         ]
+        # All ignore globs translated once into a single alternation
+        self._ignore_re = re.compile(
+            '|'.join(f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in self.ignore_patterns)
+        )
+        self._ignore_dir_names = ignored_dir_names(self.ignore_patterns)
+        # What the walk still has to match once those directories are pruned by name
+        walk_patterns = walk_ignore_patterns(self.ignore_patterns)
+        self._walk_ignore_re = re.compile(
+            '|'.join(f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in walk_patterns)
+        ) if walk_patterns else None
     
     def _get_language_from_extension(self, file_path: str) -> Optional[str]:
         """Determine language from file extension."""
-        ext = Path(file_path).suffix.lower()
-        ext_to_lang = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.jsx': 'javascript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-        }
-        return ext_to_lang.get(ext)
+        return EXT_TO_LANG.get(os.path.splitext(file_path)[1].lower())
     
     def _should_ignore_file(self, file_path: str) -> bool:
         """Check if file should be ignored."""
-        for pattern in self.ignore_patterns:
-            if self._matches_pattern(file_path, pattern):
-                return True
-        return False
-    
-    def _matches_pattern(self, file_path: str, pattern: str) -> bool:
-        """Check if file path matches ignore pattern."""
-        import fnmatch
-        return fnmatch.fnmatch(file_path, pattern)
+        return self._ignore_re.match(os.path.normcase(file_path)) is not None
     
     def _has_documentation_before(self, content: str, position: int, language: str) -> bool:
         """Check if there's documentation before the given position."""
-        before_content = content[:position]
-        lines = before_content.split('\n')
+        is_doc_line = DOC_LINE_CHECKS.get(language)
+        if is_doc_line is None:
+            return False
         
         # Look at the last few lines before the position
-        for line in reversed(lines[-5:]):
-            line = line.strip()
+        for line in prev_lines(content, position, 5):
             if not line:
                 continue
             
             # Check for comment patterns
-            if language == 'python':
-                if line.startswith('#') or '"""' in line or "'''" in line:
-                    return True
-            elif language in ['javascript', 'typescript']:
-                if line.startswith('//') or '/*' in line or '*/' in line:
-                    return True
-            elif language in ['java', 'cpp', 'c']:
-                if line.startswith('//') or '/*' in line or '*/' in line:
-                    return True
-            elif language == 'go':
-                if line.startswith('//'):
-                    return True
-            elif language == 'rust':
-                if line.startswith('///') or line.startswith('//'):
-                    return True
+            if is_doc_line(line):
+                return True
             
             # If we hit non-empty, non-comment code, stop looking
-            if line and not any(line.startswith(p) for p in ['//', '#', '/*', '*', '///']):
+            if line and not line.startswith(COMMENT_LINE_PREFIXES):
                 break
         
         return False
@@ -99,8 +103,15 @@ class SimpleAnalyzer:
             return []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # One raw read and decode, skipping the text I/O layer
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            if _is_generated(data):
+                return []
+            content = data.decode('utf-8')
+            if '\r' in content:
+                # Same universal newline handling as a text-mode read
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
         except Exception as e:
             print(f"Error reading file {file_path}: {e}")
             return []
@@ -110,73 +121,68 @@ class SimpleAnalyzer:
     def _find_undocumented_functions(self, content: str, language: str, file_path: str) -> List[Dict]:
         """Find undocumented functions using regex patterns."""
         undocumented = []
+        newlines = None
         
-        if language == 'python':
-            # Python function patterns
-            function_patterns = [
-                (r'def\s+(\w+)\s*\(', 'function'),
-                (r'class\s+(\w+)\s*[\(:]', 'class'),
-            ]
-            
-            for pattern, func_type in function_patterns:
-                for match in re.finditer(pattern, content):
-                    func_name = match.group(1)
-                    start_pos = match.start()
-                    
-                    # Check if there's a comment/docstring before this function
-                    has_doc = self._has_documentation_before(content, start_pos, language)
-                    if not has_doc:
-                        line_num = content[:start_pos].count('\n') + 1
-                        undocumented.append({
-                            'name': func_name,
-                            'type': func_type,
-                            'line': line_num,
-                            'position': start_pos,
-                            'file': file_path
-                        })
-        
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript function patterns
-            function_patterns = [
-                (r'function\s+(\w+)\s*\(', 'function'),
-                (r'const\s+(\w+)\s*=\s*\(', 'function'),
-                (r'let\s+(\w+)\s*=\s*\(', 'function'),
-                (r'var\s+(\w+)\s*=\s*\(', 'function'),
-                (r'(\w+)\s*:\s*function', 'function'),
-                (r'class\s+(\w+)\s*[{\s]', 'class'),
-            ]
-            
-            for pattern, func_type in function_patterns:
-                for match in re.finditer(pattern, content):
-                    func_name = match.group(1)
-                    start_pos = match.start()
-                    
-                    has_doc = self._has_documentation_before(content, start_pos, language)
-                    if not has_doc:
-                        line_num = content[:start_pos].count('\n') + 1
-                        undocumented.append({
-                            'name': func_name,
-                            'type': func_type,
-                            'line': line_num,
-                            'position': start_pos,
-                            'file': file_path
-                        })
+        # One finditer per pattern: re scans for a lone pattern's literal prefix far
+        # faster than it can try an alternation at every position
+        for regex, func_type in FUNC_REGEXES.get(language, ()):
+            for match in regex.finditer(content):
+                func_name = match.group(1)
+                start_pos = match.start()
+                
+                # Check if there's a comment/docstring before this function
+                has_doc = self._has_documentation_before(content, start_pos, language)
+                if not has_doc:
+                    if newlines is None:
+                        newlines = newline_offsets(content)
+                    undocumented.append({
+                        'name': func_name,
+                        'type': func_type,
+                        # Newlines before start_pos, found by bisection instead of rescanning the prefix
+                        'line': bisect.bisect_left(newlines, start_pos) + 1,
+                        'position': start_pos,
+                        'file': file_path
+                    })
         
         return undocumented
     
+    def _iter_source_files(self, directory: str):
+        """Yield paths of analyzable source files under a directory, pruning ignored dirs."""
+        return iter_source_files(
+            directory, self._ignore_re, self._walk_ignore_re, self._ignore_dir_names,
+            self._get_language_from_extension
+        )
+    
     def analyze_directory(self, directory: str) -> Dict[str, List[Dict]]:
         """Analyze all files in a directory."""
-        results = {}
+        file_paths = list(self._iter_source_files(directory))
         
-        for root, dirs, files in os.walk(directory):
-            # Remove ignored directories
-            dirs[:] = [d for d in dirs if not self._should_ignore_file(os.path.join(root, d))]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                if not self._should_ignore_file(file_path):
-                    undocumented = self.analyze_file(file_path)
-                    if undocumented:
-                        results[file_path] = undocumented
+        if len(file_paths) < _PARALLEL_MIN_FILES:
+            # Not worth the cost of starting worker processes
+            analyzed = ((file_path, self.analyze_file(file_path)) for file_path in file_paths)
+            return {file_path: undocumented for file_path, undocumented in analyzed if undocumented}
+        
+        results = {}
+        workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Hand each worker one contiguous chunk instead of one file per round trip
+            chunk_size = math.ceil(len(file_paths) / workers)
+            for file_path, undocumented in executor.map(_analyze_one, file_paths, chunksize=chunk_size):
+                if isinstance(undocumented, Exception):
+                    print(f"Error analyzing file {file_path}: {undocumented}")
+                elif undocumented:
+                    results[file_path] = undocumented
         
         return results
+
+
+def _analyze_one(file_path: str) -> Tuple[str, Union[List[Dict], Exception]]:
+    """Analyze one file in a worker process, returning errors instead of raising them."""
+    global _worker_analyzer
+    try:
+        if _worker_analyzer is None:
+            _worker_analyzer = SimpleAnalyzer()
+        return file_path, _worker_analyzer.analyze_file(file_path)
+    except Exception as e:
+        # A raised exception would be re-raised by map and abandon the remaining results
+        return file_path, e
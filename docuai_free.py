@@ -3,13 +3,235 @@
 DocuAI Free Version - No AI dependencies, completely free and fast.
 """
 
+import ast
+import bisect
+import fnmatch
+import mmap
+import operator
 import os
 import sys
 import re
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Dict, Optional, Tuple, Union
 from pathlib import Path
 
 
+# Lines starting with these are comment lines rather than code
+_COMMENT_LINE_PREFIXES = ('//', '#', '/*', '*')
+
+
+def _is_python_doc_line(line: str) -> bool:
+    """Check whether a stripped Python line is a comment or part of a docstring."""
+    return line.startswith('#') or '"""' in line or "'''" in line
+
+
+def _is_c_style_doc_line(line: str) -> bool:
+    """Check whether a stripped line is a // or /* */ comment line."""
+    return line.startswith('//') or '/*' in line or '*/' in line
+
+
+def _is_line_comment(line: str) -> bool:
+    """Check whether a stripped line is a // comment."""
+    return line.startswith('//')
+
+
+# Documentation line check by language, looked up once per definition instead of per line.
+# Plain str methods beat a regex alternation here, which re cannot anchor on a literal.
+_DOC_LINE_CHECKS = {
+    'python': _is_python_doc_line,
+    'javascript': _is_c_style_doc_line,
+    'typescript': _is_c_style_doc_line,
+    'java': _is_c_style_doc_line,
+    'cpp': _is_c_style_doc_line,
+    'c': _is_c_style_doc_line,
+    'go': _is_line_comment,
+    'rust': _is_line_comment,
+}
+
+
+# File extension to language name
+_EXT_TO_LANG = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.jsx': 'javascript',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.cc': 'cpp',
+    '.cxx': 'cpp',
+    '.c': 'c',
+    '.go': 'go',
+    '.rs': 'rust',
+}
+
+
+_COLON_FUNCTION_RE = re.compile(r'(\w+)\s*:\s*function')
+_COLON_FUNCTION_ANCHOR_RE = re.compile(r':\s*function')
+
+
+def _finditer_colon_functions(content: str):
+    """Find `name: function` matches from their ':' instead of trying the pattern at every position."""
+    end = 0
+    for anchor in _COLON_FUNCTION_ANCHOR_RE.finditer(content):
+        # Walk back over the optional whitespace and the name, never into the previous match
+        start = anchor.start()
+        while start > end and content[start - 1].isspace():
+            start -= 1
+        name_end = start
+        while start > end and (content[start - 1].isalnum() or content[start - 1] == '_'):
+            start -= 1
+        if start == name_end:
+            continue
+        match = _COLON_FUNCTION_RE.match(content, start)
+        if match:
+            yield match
+            end = match.end()
+
+
+# (required keyword, finditer, definition type) keyed by language; a pattern
+# can only match if its keyword occurs, which a substring search checks cheaply
+_FUNC_REGEXES_PY = [
+    ('def', re.compile(r'def\s+(\w+)\s*\(').finditer, 'function'),
+    ('class', re.compile(r'class\s+(\w+)\s*[\(:]').finditer, 'class'),
+]
+_FUNC_REGEXES_JS = [
+    ('function', re.compile(r'function\s+(\w+)\s*\(').finditer, 'function'),
+    ('const', re.compile(r'const\s+(\w+)\s*=\s*\(').finditer, 'function'),
+    ('let', re.compile(r'let\s+(\w+)\s*=\s*\(').finditer, 'function'),
+    ('var', re.compile(r'var\s+(\w+)\s*=\s*\(').finditer, 'function'),
+    # With no literal prefix, a plain finditer would be tried at every position
+    ('function', _finditer_colon_functions, 'function'),
+    ('class', re.compile(r'class\s+(\w+)\s*[{\s]').finditer, 'class'),
+]
+_FUNC_REGEXES = {
+    'python': _FUNC_REGEXES_PY,
+    'javascript': _FUNC_REGEXES_JS,
+    'typescript': _FUNC_REGEXES_JS,
+}
+# Each language's pattern keywords as bytes, to test a file before decoding it
+_FUNC_KEYWORDS = {
+    language: tuple({keyword.encode() for keyword, _, _ in patterns})
+    for language, patterns in _FUNC_REGEXES.items()
+}
+
+
+# A "**/<name>/**" ignore glob: every path under a directory called <name>
+_IGNORE_DIR_RE = re.compile(r'\*\*/([^*?\[\]/]+)/\*\*')
+
+
+def _ignored_dir_names(patterns: List[str]) -> FrozenSet[str]:
+    """Get the directory names that "**/<name>/**" ignore patterns exclude outright."""
+    names = set()
+    for pattern in patterns:
+        match = _IGNORE_DIR_RE.fullmatch(pattern)
+        if match:
+            names.add(os.path.normcase(match.group(1)))
+    return frozenset(names)
+
+
+def _line_starts(content: str) -> List[int]:
+    """Get the offset where each line of the content starts."""
+    starts = [0]
+    pos = content.find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return starts
+
+
+def _prev_lines(content: str, position: int, n: int) -> Iterator[str]:
+    """Yield up to n stripped lines ending at position, nearest first."""
+    # Lazy, since callers usually stop at the first line of code
+    end = position
+    for _ in range(n):
+        newline = content.rfind('\n', 0, end)
+        yield content[newline + 1:end].strip()
+        if newline == -1:
+            return
+        end = newline
+
+
+# Directories with fewer files than this are analyzed in-process
+_PARALLEL_MIN_FILES = 32
+
+# Files per batch handed to a pool worker, all prefetched together
+_READ_BATCH = 64
+
+# Per-process analyzer used by _analyze_batch in pool workers
+_worker_analyzer = None
+
+# Fields of statements, exception handlers and match cases that hold nested statements.
+# Definitions are statements, so they can't occur anywhere else in the tree.
+_NESTED_STMT_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _iter_definitions(tree: ast.Module) -> Iterator[ast.AST]:
+    """Yield the function and class definitions in a module without visiting any expression."""
+    # ast.walk would also visit every expression node, the bulk of the tree
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _DEFINITION_TYPES):
+            yield node
+        for field in _NESTED_STMT_FIELDS:
+            stack.extend(getattr(node, field, ()))
+
+
+# Files at least this large are memory-mapped instead of read into a bytes copy
+_MMAP_MIN_SIZE = 1024 * 1024
+
+
+def _decode_source(data, language: str) -> Optional[str]:
+    """Decode raw source bytes or a mapping of them, or None if no definition keyword occurs."""
+    # find() rather than `in`, which on an mmap only looks for a single byte
+    if all(data.find(keyword) == -1 for keyword in _FUNC_KEYWORDS[language]):
+        return None
+    content = str(data, 'utf-8')
+    if '\r' in content:
+        # Same universal newline handling as a text-mode read
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+# Findings are cached as (name, type, line, position) tuples, half the memory of
+# the dicts; 'file' is the cache key
+_pack_finding = operator.itemgetter('name', 'type', 'line', 'position')
+
+
+_CAMEL_RE = re.compile(r'([a-z])([A-Z])')
+
+
+@lru_cache(maxsize=4096)
+def _camel_to_sentence(text: str) -> str:
+    """Convert camelCase to sentence case."""
+    # Insert space before capital letters, then lowercase and capitalize
+    return _CAMEL_RE.sub(r'\1 \2', text).lower().capitalize()
+
+
+# Comment templates keyed by (language, kind); {s} is the sentence-cased name
+_JSDOC_TEMPLATES = {
+    'function': '/**\n * {s}\n * \n * @param {{}} TODO: Add parameter descriptions\n * @returns {{}} TODO: Add return description\n */',
+    'class': '/**\n * {s} class\n * \n * TODO: Add class description\n */',
+}
+_JAVADOC_TEMPLATES = {
+    'function': '/**\n * {s}\n * \n * @param TODO: Add parameter descriptions\n * @return TODO: Add return description\n */',
+    'class': '/**\n * {s} class\n * \n * TODO: Add class description\n */',
+}
+_TEMPLATES = {
+    ('python', 'function'): '"""\n    {s}.\n    \n    Args:\n        TODO: Add parameter descriptions\n    \n    Returns:\n        TODO: Add return description\n    """',
+    ('python', 'class'): '"""\n    {s} class.\n    \n    TODO: Add class description\n    """',
+    **{(lang, kind): tpl for lang in ('javascript', 'typescript') for kind, tpl in _JSDOC_TEMPLATES.items()},
+    **{(lang, kind): tpl for lang in ('java', 'cpp', 'c') for kind, tpl in _JAVADOC_TEMPLATES.items()},
+    ('go', 'function'): '// {s} TODO: Add function description\n// TODO: Add parameter and return descriptions',
+    ('go', 'class'): '// {s} TODO: Add struct/interface description',
+    ('rust', 'function'): '/// {s}\n/// TODO: Add function description\n/// TODO: Add parameter and return descriptions',
+    ('rust', 'class'): '/// {s} TODO: Add struct/trait description',
+}
+
+
 class DocuAIFree:
     """Free version of DocuAI with no external dependencies."""
     
@@ -25,116 +247,64 @@ class DocuAIFree:
             "**/build/**",
             "**/dist/**"
         ]
+        # All ignore globs translated once into a single alternation
+        self._ignore_re = re.compile(
+            '|'.join(f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in self.ignore_patterns)
+        )
+        self._ignore_dir_names = _ignored_dir_names(self.ignore_patterns)
+        # What the walk still has to match once those directories are pruned by name
+        walk_patterns = [p for p in self.ignore_patterns if not _IGNORE_DIR_RE.fullmatch(p)]
+        self._walk_ignore_re = re.compile(
+            '|'.join(f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in walk_patterns)
+        ) if walk_patterns else None
+        # path -> ((mtime_ns, size), packed findings) of files analyzed without errors
+        self._file_cache: Dict[str, Tuple[Tuple[int, int], List[Tuple]]] = {}
     
     def _get_language_from_extension(self, file_path: str) -> Optional[str]:
         """Determine language from file extension."""
-        ext = Path(file_path).suffix.lower()
-        ext_to_lang = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.jsx': 'javascript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-        }
-        return ext_to_lang.get(ext)
+        return _EXT_TO_LANG.get(os.path.splitext(file_path)[1].lower())
     
     def _should_ignore_file(self, file_path: str) -> bool:
         """Check if file should be ignored."""
-        for pattern in self.ignore_patterns:
-            if self._matches_pattern(file_path, pattern):
-                return True
-        return False
-    
-    def _matches_pattern(self, file_path: str, pattern: str) -> bool:
-        """Check if file path matches ignore pattern."""
-        import fnmatch
-        return fnmatch.fnmatch(file_path, pattern)
+        # Same matching as fnmatch.fnmatch, with every pattern tried in one regex pass
+        return self._ignore_re.match(os.path.normcase(file_path)) is not None
     
     def _has_documentation_before(self, content: str, position: int, language: str) -> bool:
         """Check if there's documentation before the given position."""
-        before_content = content[:position]
-        lines = before_content.split('\n')
+        is_doc_line = _DOC_LINE_CHECKS.get(language)
+        if is_doc_line is None:
+            return False
         
         # Look at the last few lines before the position
-        for line in reversed(lines[-5:]):
-            line = line.strip()
+        for line in _prev_lines(content, position, 5):
             if not line:
                 continue
             
             # Check for comment patterns
-            if language == 'python':
-                if line.startswith('#') or '"""' in line or "'''" in line:
-                    return True
-            elif language in ['javascript', 'typescript']:
-                if line.startswith('//') or '/*' in line or '*/' in line:
-                    return True
-            elif language in ['java', 'cpp', 'c']:
-                if line.startswith('//') or '/*' in line or '*/' in line:
-                    return True
-            elif language == 'go':
-                if line.startswith('//'):
-                    return True
-            elif language == 'rust':
-                if line.startswith('///') or line.startswith('//'):
-                    return True
+            if is_doc_line(line):
+                return True
             
             # If we hit non-empty, non-comment code, stop looking
-            if line and not any(line.startswith(p) for p in ['//', '#', '/*', '*', '///']):
+            if line and not line.startswith(_COMMENT_LINE_PREFIXES):
                 break
         
         return False
     
     def _camel_to_sentence(self, text: str) -> str:
         """Convert camelCase to sentence case."""
-        # Insert space before capital letters
-        result = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-        # Convert to lowercase and capitalize first letter
-        return result.lower().capitalize()
+        return _camel_to_sentence(text)
     
     def generate_comment(self, function_info: Dict, language: str) -> str:
         """Generate a comment for a function or class."""
         name = function_info['name']
-        func_type = function_info['type']
-        
-        if language == 'python':
-            if func_type == 'function':
-                return f'"""\n    {self._camel_to_sentence(name)}.\n    \n    Args:\n        TODO: Add parameter descriptions\n    \n    Returns:\n        TODO: Add return description\n    """'
-            else:  # class
-                return f'"""\n    {self._camel_to_sentence(name)} class.\n    \n    TODO: Add class description\n    """'
+        # Anything that isn't a function (class, struct, trait...) gets the class template
+        kind = 'function' if function_info['type'] == 'function' else 'class'
         
-        elif language in ['javascript', 'typescript']:
-            if func_type == 'function':
-                return f'/**\n * {self._camel_to_sentence(name)}\n * \n * @param {{}} TODO: Add parameter descriptions\n * @returns {{}} TODO: Add return description\n */'
-            else:  # class
-                return f'/**\n * {self._camel_to_sentence(name)} class\n * \n * TODO: Add class description\n */'
-        
-        elif language in ['java', 'cpp', 'c']:
-            if func_type == 'function':
-                return f'/**\n * {self._camel_to_sentence(name)}\n * \n * @param TODO: Add parameter descriptions\n * @return TODO: Add return description\n */'
-            else:  # class
-                return f'/**\n * {self._camel_to_sentence(name)} class\n * \n * TODO: Add class description\n */'
-        
-        elif language == 'go':
-            if func_type == 'function':
-                return f'// {self._camel_to_sentence(name)} TODO: Add function description\n// TODO: Add parameter and return descriptions'
-            else:  # class/struct
-                return f'// {self._camel_to_sentence(name)} TODO: Add struct/interface description'
-        
-        elif language == 'rust':
-            if func_type == 'function':
-                return f'/// {self._camel_to_sentence(name)}\n/// TODO: Add function description\n/// TODO: Add parameter and return descriptions'
-            else:  # struct/trait
-                return f'/// {self._camel_to_sentence(name)} TODO: Add struct/trait description'
-        
-        # Default fallback
-        return f'// TODO: Add documentation for {name}'
+        template = _TEMPLATES.get((language, kind))
+        if template is None:
+            # Default fallback
+            return f'// TODO: Add documentation for {name}'
+        return template.format(s=_camel_to_sentence(name))
     
     def analyze_file(self, file_path: str) -> List[Dict]:
         """Analyze a single file for undocumented functions and classes."""
@@ -142,91 +312,207 @@ class DocuAIFree:
             return []
         
         language = self._get_language_from_extension(file_path)
-        if not language:
+        if language not in _FUNC_REGEXES:
+            # No patterns for this language, so nothing to find: don't even read it
             return []
         
+        if self._is_cached(file_path):
+            return self._cached_findings(file_path)
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # One raw read (or mapping) and decode, skipping the text I/O layer
+            with open(file_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_size >= _MMAP_MIN_SIZE:
+                    # Prefilter and decode straight from the page cache, never copying the raw bytes
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        content = _decode_source(data, language)
+                else:
+                    content = _decode_source(f.read(), language)
+            key = (stat.st_mtime_ns, stat.st_size)
         except Exception as e:
             print(f"Error reading file {file_path}: {e}")
             return []
         
-        return self._find_undocumented_functions(content, language, file_path)
+        if content is None:
+            # No definition keyword anywhere, so nothing to scan
+            self._file_cache[file_path] = (key, [])
+            return []
+        
+        undocumented = self._find_undocumented_functions(content, language, file_path)
+        self._file_cache[file_path] = (key, [_pack_finding(entry) for entry in undocumented])
+        return undocumented
+    
+    def _is_cached(self, file_path: str) -> bool:
+        """Check whether a file's findings are cached and it hasn't changed since."""
+        cached = self._file_cache.get(file_path)
+        if cached is None:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return cached[0] == (stat.st_mtime_ns, stat.st_size)
+    
+    def _cached_findings(self, file_path: str) -> List[Dict]:
+        """Get a file's findings from the cache, as new dicts."""
+        return [
+            {'name': name, 'type': func_type, 'line': line, 'position': position, 'file': file_path}
+            for name, func_type, line, position in self._file_cache[file_path][1]
+        ]
     
     def _find_undocumented_functions(self, content: str, language: str, file_path: str) -> List[Dict]:
-        """Find undocumented functions using regex patterns."""
+        """Find undocumented functions, from the syntax tree for Python and with regex patterns otherwise."""
+        if language == 'python':
+            undocumented = self._find_undocumented_python(content, file_path)
+            if undocumented is not None:
+                return undocumented
+        
         undocumented = []
+        line_starts = None
         
-        if language == 'python':
-            # Python function patterns
-            function_patterns = [
-                (r'def\s+(\w+)\s*\(', 'function'),
-                (r'class\s+(\w+)\s*[\(:]', 'class'),
-            ]
-            
-            for pattern, func_type in function_patterns:
-                for match in re.finditer(pattern, content):
-                    func_name = match.group(1)
-                    start_pos = match.start()
-                    
-                    # Check if there's a comment/docstring before this function
-                    has_doc = self._has_documentation_before(content, start_pos, language)
-                    if not has_doc:
-                        line_num = content[:start_pos].count('\n') + 1
-                        undocumented.append({
-                            'name': func_name,
-                            'type': func_type,
-                            'line': line_num,
-                            'position': start_pos,
-                            'file': file_path
-                        })
+        for keyword, finditer, func_type in _FUNC_REGEXES.get(language, ()):
+            if keyword not in content:
+                # Skip the regex scan, which is slow for patterns without a literal prefix
+                continue
+            for match in finditer(content):
+                func_name = match.group(1)
+                start_pos = match.start()
+                
+                # Check if there's a comment/docstring before this function
+                has_doc = self._has_documentation_before(content, start_pos, language)
+                if not has_doc:
+                    if line_starts is None:
+                        line_starts = _line_starts(content)
+                    undocumented.append({
+                        'name': func_name,
+                        'type': func_type,
+                        # Lines starting at or before start_pos, by bisection instead of rescanning the prefix
+                        'line': bisect.bisect_right(line_starts, start_pos),
+                        'position': start_pos,
+                        'file': file_path
+                    })
+        
+        return undocumented
+    
+    def _find_undocumented_python(self, content: str, file_path: str) -> Optional[List[Dict]]:
+        """Find undocumented Python functions and classes with ast, or None if the source doesn't parse."""
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            # Fall back to the regex patterns
+            return None
         
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript function patterns
-            function_patterns = [
-                (r'function\s+(\w+)\s*\(', 'function'),
-                (r'const\s+(\w+)\s*=\s*\(', 'function'),
-                (r'let\s+(\w+)\s*=\s*\(', 'function'),
-                (r'var\s+(\w+)\s*=\s*\(', 'function'),
-                (r'(\w+)\s*:\s*function', 'function'),
-                (r'class\s+(\w+)\s*[{\s]', 'class'),
-            ]
+        line_starts = _line_starts(content)
+        # UTF-8 byte and character offsets only differ in non-ASCII source; the check is O(1)
+        is_ascii = content.isascii()
+        undocumented = []
+        for node in _iter_definitions(tree):
+            line_start = line_starts[node.lineno - 1]
+            if is_ascii:
+                start_pos = line_start + node.col_offset
+            else:
+                # col_offset counts UTF-8 bytes, positions count characters
+                line = content[line_start:line_start + node.col_offset]
+                start_pos = line_start + len(line.encode('utf-8')[:node.col_offset].decode('utf-8', 'ignore'))
+            
+            # A docstring, or a comment right above the definition, documents it
+            if ast.get_docstring(node, clean=False) is not None:
+                continue
+            if self._has_documentation_before(content, start_pos, 'python'):
+                continue
             
-            for pattern, func_type in function_patterns:
-                for match in re.finditer(pattern, content):
-                    func_name = match.group(1)
-                    start_pos = match.start()
-                    
-                    has_doc = self._has_documentation_before(content, start_pos, language)
-                    if not has_doc:
-                        line_num = content[:start_pos].count('\n') + 1
-                        undocumented.append({
-                            'name': func_name,
-                            'type': func_type,
-                            'line': line_num,
-                            'position': start_pos,
-                            'file': file_path
-                        })
+            undocumented.append({
+                'name': node.name,
+                'type': 'class' if isinstance(node, ast.ClassDef) else 'function',
+                'line': node.lineno,
+                'position': start_pos,
+                'file': file_path
+            })
         
+        # The walk is depth-first from the last statement; report in source order
+        undocumented.sort(key=lambda entry: entry['position'])
         return undocumented
     
+    def _iter_source_files(self, directory: str):
+        """Yield paths of analyzable source files under a directory, pruning ignored dirs."""
+        ignore_re = self._walk_ignore_re
+        if any(os.path.normcase(part) in self._ignore_dir_names for part in directory.split(os.sep)):
+            # The walk starts inside an ignored directory, so every pattern still applies
+            ignore_re = self._ignore_re
+        
+        stack = [directory]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    entries = list(entries)
+            except OSError:
+                # Unreadable directory: skip it like os.walk does
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                # Directories excluded by name are pruned without running the ignore regex
+                if os.path.normcase(entry.name) in self._ignore_dir_names and entry.is_dir():
+                    continue
+                if ignore_re is not None and ignore_re.match(os.path.normcase(entry.path)):
+                    continue
+                # DirEntry caches the file type from the directory listing, no extra stat
+                if entry.is_dir():
+                    # Like os.walk, don't descend into symlinked directories
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif self._get_language_from_extension(entry.name):
+                    yield entry.path
+            
+            # Reversed so subdirectories are visited in listing order, as with os.walk
+            stack.extend(reversed(subdirs))
+    
     def analyze_directory(self, directory: str) -> Dict[str, List[Dict]]:
         """Analyze all files in a directory."""
-        results = {}
+        return dict(self.iter_directory(directory))
+    
+    def iter_directory(self, directory: str) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield (path, findings) for each file in a directory with undocumented definitions, in walk order.
         
-        for root, dirs, files in os.walk(directory):
-            # Remove ignored directories
-            dirs[:] = [d for d in dirs if not self._should_ignore_file(os.path.join(root, d))]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                if not self._should_ignore_file(file_path):
-                    undocumented = self.analyze_file(file_path)
-                    if undocumented:
-                        results[file_path] = undocumented
+        Findings are yielded as files are analyzed, so callers can handle and drop them one file at a time.
+        """
+        file_paths = list(self._iter_source_files(directory))
         
-        return results
+        # Files unchanged since this analyzer last saw them are not read again
+        pending = [file_path for file_path in file_paths if not self._is_cached(file_path)]
+        
+        if len(pending) < _PARALLEL_MIN_FILES:
+            # Not worth the cost of starting worker processes
+            for file_path in file_paths:
+                undocumented = self.analyze_file(file_path)
+                if undocumented:
+                    yield file_path, undocumented
+            return
+        
+        pending_paths = set(pending)
+        with ProcessPoolExecutor() as executor:
+            # Workers take batches, prefetching each batch's files before analyzing them
+            batches = [pending[i:i + _READ_BATCH] for i in range(0, len(pending), _READ_BATCH)]
+            results = executor.map(_analyze_batch, batches)
+            try:
+                # Batches come back in order, so they interleave with cached files by walk order
+                analyzed = (entry for batch in results for entry in batch)
+                for file_path in file_paths:
+                    if file_path not in pending_paths:
+                        undocumented = self._cached_findings(file_path)
+                    else:
+                        _, undocumented, cache_entry = next(analyzed)
+                        if isinstance(undocumented, Exception):
+                            print(f"Error analyzing file {file_path}: {undocumented}")
+                            continue
+                        if cache_entry is not None:
+                            self._file_cache[file_path] = cache_entry
+                    if undocumented:
+                        yield file_path, undocumented
+            finally:
+                # Cancels batches not started yet if the caller stops early
+                results.close()
     
     def test(self):
         """Test DocuAI with sample code."""
@@ -290,6 +576,47 @@ class DataProcessor:
                 print("\n🧹 Cleaned up test file")
 
 
+def _prefetch(file_paths: List[str]):
+    """Ask the kernel to start reading files into the page cache, without waiting for them."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            # analyze_file reports unreadable files
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _analyze_batch(file_paths: List[str]) -> List[Tuple[str, Union[List[Dict], Exception], Optional[Tuple]]]:
+    """Analyze a batch of files in a worker process, returning errors instead of raising them.
+    
+    Each file comes with its cache entry, if any, for the parent analyzer to keep.
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = DocuAIFree()
+    
+    # All of the batch's reads are in flight at once, so later files are cached by the time they're read
+    _prefetch(file_paths)
+    
+    analyzed = []
+    for file_path in file_paths:
+        try:
+            undocumented = _worker_analyzer.analyze_file(file_path)
+            analyzed.append((file_path, undocumented, _worker_analyzer._file_cache.pop(file_path, None)))
+        except Exception as e:
+            # A raised exception would be re-raised by map and abandon the remaining results
+            analyzed.append((file_path, e, None))
+    return analyzed
+
+
 def main():
     """Main function."""
     docuai = DocuAIFree()